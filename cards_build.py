@@ -0,0 +1,14 @@
+import argparse
+
+from ygo import card_store
+
+def main():
+	parser = argparse.ArgumentParser(description="Compile the locale card databases into a single memory-mapped card store.")
+	parser.add_argument('-l', '--locale-dir', default='locale', help="Directory containing the <language>/cards.cdb files")
+	parser.add_argument('-o', '--output', default='cards.bin', help="Card store to write")
+	args = parser.parse_args()
+	count = card_store.build(args.locale_dir, args.output)
+	print("Compiled %d cards into %s." % (count, args.output))
+
+if __name__ == "__main__":
+	main()
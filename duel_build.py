@@ -6,7 +6,12 @@ ffibuilder.set_source("_duel",
 #include "card.h"
 #include "duel.h"
 #include "field.h"
+#include <cstring>
 #include <vector>
+extern "C" {
+#include "lua.h"
+#include "lauxlib.h"
+}
 int32 is_declarable(card_data const& cd, const std::vector<uint32>& opcode);
 int32 declarable(card_data *cd, int32 size, uint32 *array) {
 	std::vector<uint32> v;
@@ -15,6 +20,31 @@ int32 declarable(card_data *cd, int32 size, uint32 *array) {
 	}
 	return is_declarable(*cd, v);
 }
+static int write_chunk(lua_State* L, const void* p, size_t sz, void* ud) {
+	std::vector<char>* chunk = (std::vector<char>*)ud;
+	chunk->insert(chunk->end(), (const char*)p, (const char*)p + sz);
+	return 0;
+}
+// compiles a script into Lua bytecode, which the core loads like the script itself.
+// returns the length of the bytecode, which is only copied into buf if it fits,
+// or -1 if the script doesn't compile.
+int32 compile_script(const char* name, const char* script, int32 len, char* buf, int32 size) {
+	lua_State* L = luaL_newstate();
+	std::vector<char> chunk;
+	int32 res = -1;
+	if(luaL_loadbuffer(L, script, len, name) == 0) {
+#if LUA_VERSION_NUM >= 503
+		lua_dump(L, write_chunk, &chunk, 0);
+#else
+		lua_dump(L, write_chunk, &chunk);
+#endif
+		res = chunk.size();
+		if(res <= size)
+			memcpy(buf, chunk.data(), res);
+	}
+	lua_close(L);
+	return res;
+}
 // modified from query_card()
 uint32 query_linked_zone(ptr pduel, uint8 playerid, uint8 location, uint8 sequence) {
 	if(playerid != 0 && playerid != 1)
@@ -51,10 +81,10 @@ uint32 query_linked_zone(ptr pduel, uint8 playerid, uint8 location, uint8 sequen
 	}
 }
 """,
-libraries = ['ygo'],
+libraries = ['ygo', 'lua5.2'],
 library_dirs=['.'],
 source_extension='.cpp',
-include_dirs=['../ygopro-core'],
+include_dirs=['../ygopro-core', '/usr/include/lua5.2'],
 extra_compile_args=['-std=c++0x'],
 extra_link_args=['-Wl,-rpath,.'],
 )
@@ -105,6 +135,7 @@ int32 query_field_count(ptr pduel, uint8 playerid, uint8 location);
 int32 query_field_card(ptr pduel, uint8 playerid, uint8 location, int32 query_flag, byte* buf, int32 use_cache);
 uint32 query_linked_zone(ptr pduel, uint8 playerid, uint8 location, uint8 sequence);
 int32 declarable(struct card_data *cd, int32 size, uint32 *array);
+int32 compile_script(const char* name, const char* script, int32 len, char* buf, int32 size);
 """)
 
 if __name__ == "__main__":
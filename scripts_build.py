@@ -0,0 +1,14 @@
+import argparse
+
+from ygo import script_archive
+
+def main():
+	parser = argparse.ArgumentParser(description="Pack all Lua scripts into a single memory-mapped script archive.")
+	parser.add_argument('-s', '--script-dir', default='script', help="Directory containing the scripts")
+	parser.add_argument('-o', '--output', default='scripts.bin', help="Script archive to write")
+	args = parser.parse_args()
+	count = script_archive.build(args.script_dir, args.output)
+	print("Packed %d scripts into %s." % (count, args.output))
+
+if __name__ == "__main__":
+	main()
@@ -1,6 +1,5 @@
 import argparse
 import os.path
-import sqlite3
 
 from ygo import globals
 from ygo import i18n
@@ -11,12 +10,6 @@ from ygo.websockets import start_websocket_server
 
 def main():
 	server = Server(port = 4000, default_parser = LoginParser)
-	if os.path.exists('locale/de/cards.cdb'):
-		globals.german_db = sqlite3.connect('locale/de/cards.cdb')
-	if os.path.exists('locale/ja/cards.cdb'):
-		globals.japanese_db = sqlite3.connect('locale/ja/cards.cdb')
-	if os.path.exists('locale/es/cards.cdb'):
-		globals.spanish_db = sqlite3.connect('locale/es/cards.cdb')
 	for i in ('en', 'de', 'ja', 'es'):
 		globals.strings[i] = i18n.parse_strings(os.path.join('locale', i, 'strings.conf'))
 	globals.lflist = parse_lflist('lflist.conf')
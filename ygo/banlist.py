@@ -0,0 +1,51 @@
+import collections
+
+class Banlist(object):
+	"""One section of lflist.conf.
+
+	limits maps a code to the amount of copies allowed in a deck.
+	Copies of alias cards (alternative artworks and the like) count against
+	the limit of the card they are an alias of.
+	"""
+
+	def __init__(self, name, limits):
+		self.name = name
+		self.limits = limits
+
+	def __contains__(self, code):
+		return code in self.limits
+
+	def __getitem__(self, code):
+		return self.limits[code]
+
+	def check(self, counts, card_db):
+		"""Checks a Counter of codes against this list.
+
+		Returns a list of (code, limit, count) tuples, one for every card
+		found more often than allowed.
+		"""
+		totals = collections.Counter()
+		for code, count in counts.items():
+			totals[card_db.aliases.get(code, code)] += count
+		errors = []
+		for code, count in totals.items():
+			limit = self.limits.get(code)
+			if limit is not None and count > limit:
+				errors.append((code, limit, count))
+		return errors
+
+class LFList(collections.OrderedDict):
+	"""All banlists by name, newest first.
+
+	tcg and ocg resolve to the newest list of that kind.
+	"""
+
+	def __init__(self, lists):
+		collections.OrderedDict.__init__(self, lists)
+		self.newest = {}
+		for name in self:
+			kind = 'tcg' if name.endswith('tcg') else 'ocg'
+			self.newest.setdefault(kind, name)
+
+	def resolve(self, name):
+		return self.newest.get(name, name)
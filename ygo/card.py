@@ -1,27 +1,51 @@
 from .constants import *
 from . import globals
 
+def _static(name):
+	return property(lambda self: getattr(self.data, name))
+
 class Card(object):
-	def __init__(self, code):
-		row = globals.server.db.execute('select * from datas where id=?', (code,)).fetchone()
+	# static card data lives in a shared CardData record,
+	# only the state of this card inside a duel is stored on the object itself
+	__slots__ = (
+		'data', 'card_db', 'code', 'level', 'attack', 'defense',
+		'controller', 'location', 'sequence', 'position',
+		# set by the message handlers
+		'extra', 'param', 'release_param', 'counter', 'counters',
+		'chain_index', 'chain_spec', 'effect_description',
+		'xyz_materials', 'equip_target',
+	)
+
+	alias = _static('alias')
+	setcode = _static('setcode')
+	type = _static('type')
+	lscale = _static('lscale')
+	rscale = _static('rscale')
+	race = _static('race')
+	attribute = _static('attribute')
+	category = _static('category')
+	name = _static('name')
+	desc = _static('desc')
+	strings = _static('strings')
+
+	def __init__(self, code, card_db=None):
+		# cards inside a duel pass the card database snapshot of that duel
+		if card_db is None:
+			card_db = globals.server.card_db
+		self.card_db = card_db
+		self.data = card_db.get(code)
 		self.code = code
-		self.alias = row['alias']
-		self.setcode = row['setcode']
-		self.type = row['type']
-		self.level = row['level'] & 0xff
-		self.lscale = (row['level'] >> 24) & 0xff
-		self.rscale = (row['level'] >> 16) & 0xff
-		self.attack = row['atk']
-		self.defense = row['def']
-		self.race = row['race']
-		self.attribute = row['attribute']
-		self.category = row['category']
-		row = globals.server.db.execute('select * from texts where id = ?', (self.code, )).fetchone()
-		self.name = row[1]
-		self.desc = row[2]
-		self.strings = []
-		for i in range(3, len(row), 1):
-			self.strings.append(row[i])
+		# these may be overwritten by query results
+		self.level = self.data.level
+		self.attack = self.data.attack
+		self.defense = self.data.defense
+
+	def copy(self):
+		"""Returns a card with the same data, stats and place."""
+		card = Card.__new__(Card)
+		for name in ('data', 'card_db', 'code', 'level', 'attack', 'defense', 'controller', 'location', 'sequence', 'position'):
+			setattr(card, name, getattr(self, name))
+		return card
 
 	def set_location(self, location):
 		self.controller = location & 0xff
@@ -33,27 +57,16 @@ class Card(object):
 		return self.code == other.code and self.location == other.location and self.sequence == other.sequence
 
 	def get_name(self, pl):
-		name = self.name
-		row = pl.cdb.execute('select name from texts where id=?', (self.code,)).fetchone()
-		if row:
-			return row[0]
-		return name
+		return self.card_db.get_texts(pl.language, self.code).name
 
 	def get_desc(self, pl):
-		desc = self.desc
-		row = pl.cdb.execute('select desc from texts where id=?', (self.code,)).fetchone()
-		if row:	
-			return row[0]
-		return desc
+		return self.card_db.get_texts(pl.language, self.code).desc
 
 	def get_strings(self, pl, code=None):
-		row = pl.cdb.execute('select * from texts where id = ?', (code or self.code, )).fetchone()
-		if not row:
+		try:
+			return self.card_db.get_texts(pl.language, code or self.code).strings
+		except KeyError:
 			return self.strings
-		strings = []
-		for i in range(3, len(row), 1):
-			strings.append(row[i])
-		return strings
 
 	def get_effect_description(self, pl, i, existing=False):
 		s = ''
@@ -0,0 +1,206 @@
+from array import array
+import collections
+import functools
+import os.path
+import sqlite3
+import weakref
+
+from . import card_store
+from .card_store import COLUMNS
+from .constants import TYPE_EXTRA
+from .name_index import NameIndex
+
+CardData = collections.namedtuple('CardData', (
+	'code', 'alias', 'setcode', 'type', 'level', 'lscale', 'rscale',
+	'attack', 'defense', 'race', 'attribute', 'category',
+	'name', 'desc', 'strings',
+))
+
+CardTexts = collections.namedtuple('CardTexts', ('name', 'desc', 'strings'))
+
+# maximum amount of (language, code) entries kept in the text cache
+TEXT_CACHE_SIZE = 8192
+
+class CardDatabase(object):
+	"""Read-only access to the card databases.
+
+	The whole datas table is loaded into typed arrays on creation,
+	one array per column, with index mapping a card code to its row.
+	If an up to date compiled card store is given, the columns and texts
+	are read from that memory-mapped file instead of the SQLite databases.
+	Static card data is built once per code from those arrays and
+	shared by every Card object created for it afterwards.
+	Texts from the localized databases are kept in a bounded LRU cache,
+	codes missing from a localized database are cached as well
+	and fall back to the english texts.
+	Card names of a language are indexed for substring searches the first
+	time that language is searched, positions in those indexes are rows
+	in codes.
+	extra_deck holds the codes of all cards belonging into the extra deck,
+	aliases maps the code of every alias card to the card it is an alias of.
+	A CardDatabase is an immutable snapshot of the databases at the time
+	it was created. The server may replace it with a newer one, duels
+	register in duels and keep using the snapshot they started with.
+	"""
+
+	def __init__(self, locale_dir='locale', store_file=None):
+		self.language_dbs = {}
+		for language, fn in card_store.database_files(locale_dir).items():
+			# snapshots are loaded in a worker thread
+			self.language_dbs[language] = sqlite3.connect(fn, check_same_thread=False)
+		self.db = self.language_dbs['en']
+		self.db.row_factory = sqlite3.Row
+		self.card_data = {}
+		self.duels = weakref.WeakSet()
+		self.localized_texts = functools.lru_cache(maxsize=TEXT_CACHE_SIZE)(self.load_localized_texts)
+		self.store = None
+		if store_file is not None and os.path.exists(store_file):
+			if card_store.is_current(store_file, locale_dir):
+				self.store = card_store.CardStore(store_file)
+			else:
+				print("Card store %s is older than the card databases, ignoring it." % store_file)
+		if self.store is not None:
+			self.load_store()
+		else:
+			self.load_datas()
+		self.extra_deck = frozenset(code for code, type in zip(self.codes, self.type) if type & TYPE_EXTRA)
+		self.aliases = {code: alias for code, alias in zip(self.codes, self.alias) if alias}
+		# NameIndex by language, see name_index
+		self.name_indexes = {}
+
+	def load_datas(self):
+		self.codes = array('I')
+		self.index = {}
+		columns = [array(t) for c, n, t in COLUMNS]
+		query = 'select id, %s from datas' % ', '.join(c for c, n, t in COLUMNS)
+		for i, row in enumerate(self.db.execute(query)):
+			self.codes.append(row[0])
+			self.index[row[0]] = i
+			for column, value in zip(columns, row[1:]):
+				column.append(value)
+		for (c, name, t), column in zip(COLUMNS, columns):
+			setattr(self, name, column)
+
+	def load_store(self):
+		self.codes = self.store.codes
+		self.index = dict(zip(self.codes, range(len(self.codes))))
+		for c, name, t in COLUMNS:
+			setattr(self, name, self.store.columns[name])
+
+	def load_names(self, language):
+		"""Returns the names of all cards in a language, None for missing ones."""
+		if self.store is not None:
+			return [self.store.get_name(language, i) for i in range(len(self.codes))]
+		names = dict(self.language_dbs[language].execute('select id, name from texts'))
+		return [names.get(code) for code in self.codes]
+
+	def get(self, code):
+		data = self.card_data.get(code)
+		if data is None:
+			data = self.load(code)
+			self.card_data[code] = data
+		return data
+
+	def load(self, code):
+		i = self.index[code]
+		level = self.level[i]
+		if self.store is not None:
+			text = self.store.get_texts('en', i)
+		else:
+			text = self.db.execute('select * from texts where id=?', (code,)).fetchone()
+			if text is not None:
+				text = (text[1], text[2], tuple(text[3:]))
+		if text is None:
+			text = ('', '', ())
+		return CardData(
+			code=code,
+			alias=self.alias[i],
+			setcode=self.setcode[i],
+			type=self.type[i],
+			level=level & 0xff,
+			lscale=(level >> 24) & 0xff,
+			rscale=(level >> 16) & 0xff,
+			attack=self.attack[i],
+			defense=self.defense[i],
+			race=self.race[i],
+			attribute=self.attribute[i],
+			category=self.category[i],
+			name=text[0],
+			desc=text[1],
+			strings=text[2],
+		)
+
+	def count_deck(self, cards):
+		"""Counts a list of codes.
+
+		Returns the amount of main and extra deck cards and a Counter
+		of all codes. Unknown codes are only part of the Counter.
+		"""
+		counts = collections.Counter(cards)
+		main = extra = 0
+		for code, count in counts.items():
+			if code in self.extra_deck:
+				extra += count
+			elif code in self.index:
+				main += count
+		return main, extra, counts
+
+	def get_texts(self, language, code):
+		"""Returns name, desc and strings of a card in the given language."""
+		if language != 'en':
+			texts = self.localized_texts(language, code)
+			if texts is not None:
+				return texts
+		return self.get(code)
+
+	def load_localized_texts(self, language, code):
+		if self.store is not None:
+			i = self.index.get(code)
+			if i is None:
+				return
+			texts = self.store.get_texts(language, i)
+			if texts is None:
+				return
+			return CardTexts(*texts)
+		db = self.language_dbs.get(language)
+		if db is None:
+			return
+		row = db.execute('select * from texts where id=?', (code,)).fetchone()
+		if row is None:
+			return
+		return CardTexts(row[1], row[2], tuple(row[3:]))
+
+	def text_cache_info(self):
+		return self.localized_texts.cache_info()
+
+	def name_index(self, language):
+		"""Returns the NameIndex of a language, english for unknown ones."""
+		if language not in self.language_dbs:
+			language = 'en'
+		index = self.name_indexes.get(language)
+		if index is None:
+			index = self.build_name_index(language)
+			self.name_indexes[language] = index
+		return index
+
+	def build_name_index(self, language):
+		# cards without a localized name are found by their english one
+		english = [name or '' for name in self.load_names('en')]
+		if language == 'en':
+			return NameIndex(english)
+		names = self.load_names(language)
+		return NameIndex([n or e for n, e in zip(names, english)])
+
+	def find_cards(self, language, name):
+		"""Returns the codes of all cards whose name contains name, best matches first."""
+		return [self.codes[pos] for pos in self.name_index(language).find(name)]
+
+	def close(self):
+		"""Releases the caches and databases of a snapshot no longer in use."""
+		self.card_data.clear()
+		self.localized_texts.cache_clear()
+		self.name_indexes.clear()
+		for db in self.language_dbs.values():
+			db.close()
+		if self.store is not None:
+			self.store.close()
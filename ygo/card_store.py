@@ -0,0 +1,176 @@
+"""Compiled card store.
+
+All locale card databases are compiled into a single file which is
+memory-mapped by the server. The file contains a header, a table of
+contents and a number of sections, each aligned to 8 bytes:
+
+codes: the sorted card codes as uint32
+one section per column of the datas table (see COLUMNS),
+	holding the values of all cards in code order
+<language>.index: for every card 18 pairs of uint32 (offset, length)
+	pointing into the text section, for name, desc and str1 to str16.
+	A card missing from that language has the offset 0xffffffff.
+<language>.text: utf-8 encoded texts
+
+All numbers are stored in native byte order, the header records which one.
+"""
+
+from array import array
+import mmap
+import os
+import os.path
+import sqlite3
+import struct
+import sys
+
+# columns of the datas table kept in memory:
+# (column name, attribute name, array typecode)
+COLUMNS = (
+	('alias', 'alias', 'I'),
+	('setcode', 'setcode', 'q'),
+	('type', 'type', 'I'),
+	('level', 'level', 'I'),
+	('atk', 'attack', 'i'),
+	('def', 'defense', 'i'),
+	('race', 'race', 'I'),
+	('attribute', 'attribute', 'I'),
+	('category', 'category', 'q'),
+)
+
+# languages besides english which may ship their own card database
+LANGUAGES = ('de', 'ja', 'es')
+
+MAGIC = b'YGOCARDS'
+VERSION = 1
+HEADER = struct.Struct('<8sIII?')
+SECTION = struct.Struct('<16sQQ')
+# name, desc and 16 effect strings
+TEXT_FIELDS = 18
+MISSING = 0xffffffff
+
+def database_files(locale_dir):
+	files = {'en': os.path.join(locale_dir, 'en', 'cards.cdb')}
+	for language in LANGUAGES:
+		fn = os.path.join(locale_dir, language, 'cards.cdb')
+		if os.path.exists(fn):
+			files[language] = fn
+	return files
+
+def is_current(filename, locale_dir):
+	"""Checks that filename exists and is newer than all card databases."""
+	if not os.path.exists(filename):
+		return False
+	mtime = os.path.getmtime(filename)
+	return all(os.path.getmtime(fn) <= mtime for fn in database_files(locale_dir).values())
+
+def build(locale_dir, filename):
+	files = database_files(locale_dir)
+	db = sqlite3.connect(files['en'])
+	query = 'select id, %s from datas order by id' % ', '.join(c for c, n, t in COLUMNS)
+	rows = db.execute(query).fetchall()
+	db.close()
+	codes = [row[0] for row in rows]
+	sections = [('codes', array('I', codes).tobytes())]
+	for i, (c, name, t) in enumerate(COLUMNS):
+		sections.append((name, array(t, [row[i + 1] for row in rows]).tobytes()))
+	for language, fn in sorted(files.items()):
+		index, text = build_texts(fn, codes)
+		sections.append((language + '.index', index))
+		sections.append((language + '.text', text))
+	tmp = filename + '.tmp'
+	with open(tmp, 'wb') as fp:
+		fp.write(HEADER.pack(MAGIC, VERSION, len(codes), len(sections), sys.byteorder == 'little'))
+		offset = align(HEADER.size + SECTION.size * len(sections))
+		for name, data in sections:
+			fp.write(SECTION.pack(name.encode('ascii'), offset, len(data)))
+			offset = align(offset + len(data))
+		for name, data in sections:
+			fp.write(b'\0' * (align(fp.tell()) - fp.tell()))
+			fp.write(data)
+	os.replace(tmp, filename)
+	return len(codes)
+
+def build_texts(fn, codes):
+	db = sqlite3.connect(fn)
+	texts = {row[0]: row[1:] for row in db.execute('select * from texts')}
+	db.close()
+	index = array('I')
+	blob = bytearray()
+	for code in codes:
+		row = texts.get(code)
+		if row is None:
+			index.extend([MISSING, 0] * TEXT_FIELDS)
+			continue
+		row = (list(row) + [''] * TEXT_FIELDS)[:TEXT_FIELDS]
+		for s in row:
+			s = (s or '').encode('utf-8')
+			index.extend((len(blob), len(s)))
+			blob += s
+	return index.tobytes(), bytes(blob)
+
+def align(n):
+	return (n + 7) & ~7
+
+class CardStore(object):
+	"""Read-only view on a compiled card store.
+
+	Columns and codes are memoryviews into the mapped file, so nothing is
+	copied on load and several server processes share the same pages.
+	"""
+
+	def __init__(self, filename):
+		with open(filename, 'rb') as fp:
+			self.mmap = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+		self.buf = memoryview(self.mmap)
+		magic, version, self.count, count, little = HEADER.unpack_from(self.buf)
+		if magic != MAGIC or version != VERSION:
+			raise ValueError("%s is not a card store of version %d" % (filename, VERSION))
+		if little != (sys.byteorder == 'little'):
+			raise ValueError("%s was built on a machine with a different byte order" % filename)
+		self.sections = {}
+		for i in range(count):
+			name, offset, length = SECTION.unpack_from(self.buf, HEADER.size + i * SECTION.size)
+			self.sections[name.rstrip(b'\0').decode('ascii')] = self.buf[offset:offset + length]
+		self.codes = self.sections['codes'].cast('I')
+		self.columns = {name: self.sections[name].cast(t) for c, name, t in COLUMNS}
+		self.text_index = {}
+		for name in self.sections:
+			if name.endswith('.index'):
+				self.text_index[name[:-6]] = self.sections[name].cast('I')
+
+	def get_name(self, language, row):
+		"""Returns the name of a card or None if missing."""
+		index = self.text_index.get(language)
+		if index is None:
+			return
+		start = row * TEXT_FIELDS * 2
+		if index[start] == MISSING:
+			return
+		offset = index[start]
+		return str(self.sections[language + '.text'][offset:offset + index[start + 1]], 'utf-8')
+
+	def get_texts(self, language, row):
+		"""Returns a tuple of name, desc and strings or None if missing."""
+		index = self.text_index.get(language)
+		if index is None:
+			return
+		start = row * TEXT_FIELDS * 2
+		if index[start] == MISSING:
+			return
+		text = self.sections[language + '.text']
+		res = []
+		for i in range(start, start + TEXT_FIELDS * 2, 2):
+			offset = index[i]
+			res.append(str(text[offset:offset + index[i + 1]], 'utf-8'))
+		return res[0], res[1], tuple(res[2:])
+
+	def close(self):
+		"""Unmaps the file, codes and columns can't be used afterwards."""
+		views = [self.codes, self.buf]
+		views.extend(self.columns.values())
+		views.extend(self.text_index.values())
+		views.extend(self.sections.values())
+		# the mapping can only be closed once no view uses it
+		for view in views:
+			view.release()
+		self.mmap.close()
@@ -68,9 +68,22 @@ QUERY_OVERLAY_CARD = 0x10000
 QUERY_COUNTERS = 0x20000
 QUERY_LINK = 0x800000
 
+# query profiles for Duel.get_cards_in_location, from the cheapest to everything
+# shown about a card; use Duel.count_cards if only the amount is needed
+# code only, the place follows from the order of the results
+QUERY_PROFILE_IDENTITY = QUERY_CODE
+# code and place including the position
+QUERY_PROFILE_POSITION = QUERY_CODE | QUERY_POSITION
+# additionally level, rank, link rating, attack and defense
+QUERY_PROFILE_COMBAT = QUERY_PROFILE_POSITION | QUERY_LEVEL | QUERY_RANK | QUERY_ATTACK | QUERY_DEFENSE | QUERY_LINK
+# additionally equip target, xyz materials and counters
+QUERY_PROFILE_FULL = QUERY_PROFILE_COMBAT | QUERY_EQUIP_CARD | QUERY_OVERLAY_CARD | QUERY_COUNTERS
+
 TYPE_MONSTER = 0x1
 TYPE_FUSION = 0x40
 TYPE_SYNCHRO = 0x2000
 TYPE_XYZ = 0x800000
 TYPE_PENDULUM = 0x1000000
 TYPE_LINK = 0x4000000
+# cards of these types go into the extra deck
+TYPE_EXTRA = TYPE_FUSION | TYPE_SYNCHRO | TYPE_XYZ | TYPE_LINK
@@ -1,3 +1,4 @@
+from bisect import bisect_left, bisect_right
 from collections import OrderedDict
 from gsb.intercept import Reader
 import json
@@ -96,6 +97,8 @@ class DeckEditor:
 				else:
 					cnt[code] += 1
 			return cnt
+		# grouped view of the deck, kept up to date by s and r
+		cnt = group_cards(cards)
 		def info():
 			self.show_deck_info()
 			con.notify(con._("u: up d: down /: search forward ?: search backward t: top"))
@@ -125,16 +128,16 @@ class DeckEditor:
 				self.deck_edit_pos = 0
 				read()
 			elif caller.text == 's':
-				if cards.count(code) == 3:
+				if cnt.get(code, 0) == 3:
 					con.notify(con._("You already have 3 of this card in your deck."))
 					read()
 					return
 				cards.append(code)
+				cnt[code] = cnt.get(code, 0) + 1
 				self.save(con.player.deck, con.session, con.account, deck_name)
 				con.session.commit()
 				read()
 			elif caller.text.startswith('r'):
-				cnt = group_cards(cards)
 				rm = re.search(r'^r(\d+)', caller.text)
 				if rm:
 					n = int(rm.group(1)) - 1
@@ -143,11 +146,17 @@ class DeckEditor:
 						read()
 						return
 					code = list(cnt.keys())[n]
-				if cards.count(code) == 0:
+				if code not in cnt:
 					con.notify(con._("This card isn't in your deck."))
 					read()
 					return
 				cards.remove(code)
+				if cnt[code] == 1:
+					del cnt[code]
+				else:
+					# the first copy is gone, the card may move down the list
+					cnt.clear()
+					cnt.update(group_cards(cards))
 				self.save(con.player.deck, con.session, con.account, deck_name)
 				con.session.commit()
 				read()
@@ -177,17 +186,15 @@ class DeckEditor:
 				read()
 			elif caller.text == 'l':
 				i=0
-				cnt = group_cards(cards)
 				for code, count in cnt.items():
 					i+=1
-					card = Card(code)
+					name = globals.server.card_db.get_texts(con.player.language, code).name
 					if count == 1:
-						con.notify("%d: %s" % (i, card.get_name(con.player)))
+						con.notify("%d: %s" % (i, name))
 					else:
-						con.notify("%d: %s (x %d)" % (i, card.get_name(con.player), count))
+						con.notify("%d: %s (x %d)" % (i, name, count))
 				read()
 			elif caller.text.startswith('g'):
-				cnt = group_cards(cards)
 				gm = re.search(r'^g(\d+)', caller.text)
 				if gm:
 					n = int(gm.group(1)) - 1
@@ -196,7 +203,7 @@ class DeckEditor:
 						read()
 						return
 					code = list(cnt.keys())[n]
-					self.deck_edit_pos=globals.server.all_cards.index(code)
+					self.deck_edit_pos=globals.server.card_positions[code]
 					read()
 			elif caller.text == 'q':
 				con.notify(con._("Quit."))
@@ -222,33 +229,29 @@ class DeckEditor:
 		card = Card(code)
 		self.player.notify(card.get_info(self.player))
 
-	def find_next(self, text, start, limit=None, wrapped=False):
-		if limit:
-			cards = globals.server.all_cards[start:start+limit]
-		else:
-			cards = globals.server.all_cards[start:]
-		for i, code in enumerate(cards):
-			card = Card(code)
-			if text.lower() in card.get_name(self.player).lower():
-				return start + i
-		if wrapped:
+	def search(self, text):
+		# positions in the name index are positions in all_cards
+		return globals.server.card_db.name_index(self.player.language).search(text)
+
+	def find_next(self, text, start):
+		positions = self.search(text)
+		if not positions:
 			return
-		return self.find_next(text, 0, start, wrapped=True)
+		i = bisect_left(positions, start)
+		if i == len(positions):
+			# wrap around to the top
+			i = 0
+		return positions[i]
 
-	def find_prev(self, text, start, end=None, wrapped=False):
-		text = text.lower()
-		pos = start
-		if end is None:
-			end = 0
-		while pos >= end:
-			card = Card(globals.server.all_cards[pos])
-			name = card.get_name(self.player).lower()
-			if text in name:
-				return pos
-			pos -= 1
-		if wrapped:
+	def find_prev(self, text, start):
+		positions = self.search(text)
+		if not positions:
 			return
-		return self.find_prev(text, len(globals.server.all_cards) - 1, start, wrapped=True)
+		i = bisect_right(positions, start)
+		if i == 0:
+			# wrap around to the bottom
+			i = len(positions)
+		return positions[i - 1]
 
 	def save(self, deck, session, account, name):
 		deck = json.dumps(deck)
@@ -283,13 +286,7 @@ class DeckEditor:
 		if banlist not in globals.lflist:
 			self.player.notify(self.player._("Invalid entry."))
 			return
-		codes = set(deck)
-		errors = 0
-		for code in codes:
-			count = deck.count(code)
-			if code not in globals.lflist[banlist] or count <= globals.lflist[banlist][code]:
-				continue
-			card = Card(code)
-			self.player.notify(self.player._("%s: limit %d, found %d.") % (card.get_name(self.player), globals.lflist[banlist][code], count))
-			errors += 1
-		self.player.notify(self.player._("Check completed with %d errors.") % errors)
+		validation = globals.server.validate_deck(deck, globals.lflist[banlist])
+		for message in validation.get_messages(self.player):
+			self.player.notify(message)
+		self.player.notify(self.player._("Check completed with %d errors.") % len(validation.errors))
@@ -0,0 +1,64 @@
+from array import array
+import collections
+import hashlib
+
+# maximum amount of validated decks kept
+CACHE_SIZE = 4096
+
+class DeckValidation(object):
+	"""Result of validating a deck against a banlist.
+
+	errors holds (code, limit, count) for every card exceeding its limit,
+	the matching messages are rendered once per language.
+	"""
+
+	def __init__(self, main, extra, errors, card_db):
+		self.main = main
+		self.extra = extra
+		self.errors = errors
+		self.card_db = card_db
+		self.messages = {}
+
+	def get_messages(self, pl):
+		messages = self.messages.get(pl.language)
+		if messages is None:
+			messages = []
+			for code, limit, count in self.errors:
+				name = self.card_db.get_texts(pl.language, code).name
+				messages.append(pl._("%s: limit %d, found %d.") % (name, limit, count))
+			self.messages[pl.language] = messages
+		return messages
+
+class DeckValidator(object):
+	"""Validates decks, caching the results by deck content.
+
+	Entries are keyed by a hash of the sorted codes, the banlist and the
+	card database snapshot. clear has to be called whenever banlists or
+	card databases are reloaded, so old ones aren't kept alive.
+	"""
+
+	def __init__(self, size=CACHE_SIZE):
+		self.size = size
+		self.results = collections.OrderedDict()
+
+	def validate(self, cards, banlist, card_db):
+		"""Validates a list of codes, banlist may be None."""
+		digest = hashlib.sha1(array('I', sorted(cards)).tobytes()).digest()
+		key = (digest, banlist, card_db)
+		res = self.results.get(key)
+		if res is not None:
+			self.results.move_to_end(key)
+			return res
+		main, extra, counts = card_db.count_deck(cards)
+		if banlist is None:
+			errors = []
+		else:
+			errors = banlist.check(counts, card_db)
+		res = DeckValidation(main, extra, errors, card_db)
+		self.results[key] = res
+		if len(self.results) > self.size:
+			self.results.popitem(last=False)
+		return res
+
+	def clear(self):
+		self.results.clear()
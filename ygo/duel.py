@@ -1,62 +1,118 @@
 from _duel import ffi, lib
 import os
-import io
 import struct
 import random
 import binascii
+import importlib
 import pkgutil
 import re
 import datetime
+import weakref
 import natsort
 
+from twisted.internet import reactor
+
 from . import callback_manager
 from .card import Card
 from .constants import *
 from .duel_reader import DuelReader
+from .field import Field
+from .message_reader import MessageReader, U32
+from .script_cache import ScriptCache
 from . import globals
 from . import message_handlers
 
+# the core doesn't tell which duel asks for a card,
+# so each duel points the card reader at its snapshot before calling into it
+card_reader_db = None
+
 @ffi.def_extern()
 def card_reader_callback(code, data):
 	cd = data[0]
-	row = globals.server.db.execute('select * from datas where id=?', (code,)).fetchone()
+	cdb = card_reader_db
+	i = cdb.index[code]
+	level = cdb.level[i]
 	cd.code = code
-	cd.alias = row['alias']
-	cd.setcode = row['setcode']
-	cd.type = row['type']
-	cd.level = row['level'] & 0xff
-	cd.lscale = (row['level'] >> 24) & 0xff
-	cd.rscale = (row['level'] >> 16) & 0xff
-	cd.attack = row['atk']
-	cd.defense = row['def']
+	cd.alias = cdb.alias[i]
+	cd.setcode = cdb.setcode[i]
+	cd.type = cdb.type[i]
+	cd.level = level & 0xff
+	cd.lscale = (level >> 24) & 0xff
+	cd.rscale = (level >> 16) & 0xff
+	cd.attack = cdb.attack[i]
 	if cd.type & TYPE_LINK:
-		cd.link_marker = cd.defense
+		cd.link_marker = cdb.defense[i]
 		cd.defense = 0
 	else:
+		cd.defense = cdb.defense[i]
 		cd.link_marker = 0
-	cd.race = row['race']
-	cd.attribute = row['attribute']
+	cd.race = cdb.race[i]
+	cd.attribute = cdb.attribute[i]
 	return 0
 
 lib.set_card_reader(lib.card_reader_callback)
 
-scriptbuf = ffi.new('char[131072]')
+# layouts of query results, following the length of the result:
+# flags, code, position, level, rank, attack, defense,
+# link rating and link markers
+CARD_QUERY = struct.Struct('=9I')
+# field queries only contain the fields named by the flags
+FIELD_CARD_HEADER = struct.Struct('=3I')
+LINK_QUERY = struct.Struct('=2I')
+
+# values the core leaves out of field queries if they didn't change
+# since the last query, in the order they are sent
+CACHED_QUERIES = (QUERY_LEVEL, QUERY_RANK, QUERY_ATTACK, QUERY_DEFENSE)
+# messages after which cards may be somewhere else,
+# so previous field queries can't be used to fill in left out values
+# (shuffle deck, shuffle hand, swap grave and deck, shuffle set cards,
+# reverse deck, shuffle extra deck, move, swap)
+FIELD_MOVE_MESSAGES = frozenset((32, 33, 35, 36, 37, 39, 50, 55))
+
+# card lists in messages: code, controller, location and sequence,
+# optionally followed by a parameter
+CARDLIST = struct.Struct('=I3b')
+CARDLIST_EXTRA = struct.Struct('=I3bI')
+CARDLIST_EXTRA8 = struct.Struct('=I3bb')
+
+script_cache = ScriptCache('scripts.bin')
+
 @ffi.def_extern()
 def script_reader_callback(name, lenptr):
-	fn = ffi.string(name)
-	if not os.path.exists(fn):
+	script = script_cache.get(ffi.string(name))
+	if script is None:
 		lenptr[0] = 0
 		return ffi.NULL
-	s = open(fn, 'rb').read()
-	buf = ffi.buffer(scriptbuf)
-	buf[0:len(s)] = s
-	lenptr[0] = len(s)
-	return ffi.cast('byte *', scriptbuf)
+	lenptr[0] = script.length
+	return script.ptr
 
 lib.set_script_reader(lib.script_reader_callback)
 
+def prefetch_scripts(codes):
+	"""Loads the scripts a duel with the given cards will ask for.
+
+	Runs in a worker thread while the core may load scripts as well,
+	ScriptCache.get keeps the script stored first.
+	Returns how many weren't cached yet.
+	"""
+	names = [b'./script/constant.lua', b'./script/utility.lua']
+	names.extend(b'./script/c%d.lua' % code for code in codes)
+	return script_cache.prefetch(names)
+
+def release_card_db(card_db):
+	# the handlers of the current step may still read the snapshot,
+	# so it's given back once they are done
+	reactor.callLater(0, globals.server.release_card_db, card_db)
+
 class Duel:
+	# filled by load_message_handlers
+	message_map = {}
+	callback_map = {}
+
 	def __init__(self, seed=None):
+		# messages and query results use separate buffers, as handlers
+		# query cards while the messages are still being read
+		self.message_buf = ffi.new('char[]', 4096)
 		self.buf = ffi.new('char[]', 4096)
 		if seed is None:
 			seed = random.randint(0, 0xffffffff)
@@ -77,13 +133,33 @@ class Duel:
 		self.players = [None, None]
 		self.lp = [8000, 8000]
 		self.started = False
-		self.message_map = {}
 		self.state = ''
 		self.cards = [None, None]
 		self.revealed = {}
+		# cards by (player, location), valid until the core processes again
+		self.field_cache = {}
+		# (card, values) of every slot by (player, location)
+		# from the last field query, see query_cards_in_location
+		self.query_state = {}
+		self.card_db = globals.server.card_db
+		self.card_db.duels.add(self)
+		# called by end, replays and abandoned duels never end
+		# and give their snapshot back once they are gone
+		self.release_card_db = weakref.finalize(self, release_card_db, self.card_db)
+		self.release_card_db.atexit = False
 		self.bind_message_handlers()
+		self.field = Field(self)
+		self.field.register(self.cm)
+		# compare the field mirror with the core after every step
+		self.verify_field = bool(os.environ.get('DEBUG_FIELD', 0))
+
+	def use_card_db(self):
+		global card_reader_db
+		card_reader_db = self.card_db
 
 	def load_deck(self, player, cards, shuffle=True):
+		self.use_card_db()
+		self.field_cache.clear()
 		self.cards[player] = cards[:]
 		if shuffle:
 			random.shuffle(self.cards[player])
@@ -117,87 +193,169 @@ class Duel:
 			pl.notify(pl._("Watching stopped."))
 		if self.debug_mode is True and self.debug_fp is not None:
 			self.debug_fp.close()
+		self.card_db.duels.discard(self)
+		self.release_card_db()
 		globals.server.check_reboot()
 
 	def process(self):
+		self.use_card_db()
 		res = lib.process(self.duel)
-		l = lib.get_message(self.duel, ffi.cast('byte *', self.buf))
-		data = ffi.unpack(self.buf, l)
-		self.cm.call_callbacks('debug', event_type='process', result=res, data=data.decode('latin1'))
-		data = self.process_messages(data)
+		self.field_cache.clear()
+		l = lib.get_message(self.duel, ffi.cast('byte *', self.message_buf))
+		data = ffi.buffer(self.message_buf, l)
+		if self.debug_mode:
+			self.cm.call_callbacks('debug', event_type='process', result=res, data=data[:].decode('latin1'))
+		self.process_messages(data)
 		return res
 
 	def process_messages(self, data):
-		while data:
-			msg = int(data[0])
-			fn = self.message_map.get(msg)
-			if fn:
-				data = fn(data)
-			else:
-				print("msg %d unhandled" % msg)
-				data = b''
-		return data
+		"""Handles all messages in data, returns the amount of bytes handled.
+
+		Every handler gets a view of data starting at its message
+		and returns the length of the message.
+		"""
+		data = memoryview(data).cast('B')
+		pos = 0
+		self.field.begin_messages()
+		try:
+			while pos < len(data):
+				msg = data[pos]
+				if msg in FIELD_MOVE_MESSAGES:
+					self.query_state.clear()
+				fn = self.message_map.get(msg)
+				if fn:
+					pos += fn(self, data[pos:])
+				else:
+					print("msg %d unhandled" % msg)
+					# the rest of the messages is lost, so is everything
+					# known about the field, cards may have moved
+					self.field.invalidate()
+					self.query_state.clear()
+					break
+		finally:
+			self.field.end_messages()
+		if self.verify_field:
+			self.field.verify()
+		return pos
 
 	def read_cardlist(self, data, extra=False, extra8=False):
 		res = []
 		size = self.read_u8(data)
-		for i in range(size):
-			code = self.read_u32(data)
-			controller = self.read_u8(data)
-			location = self.read_u8(data)
-			sequence = self.read_u8(data)
-			card = self.get_card(controller, location, sequence)
-			card.extra = 0
-			if extra:
-				if extra8:
-					card.extra = self.read_u8(data)
-				else:
-					card.extra = self.read_u32(data)
+		if not extra:
+			layout = CARDLIST
+		elif extra8:
+			layout = CARDLIST_EXTRA8
+		else:
+			layout = CARDLIST_EXTRA
+		records = data.unpack_records(layout, size)
+		cards = self.get_cards([(controller, location, sequence) for code, controller, location, sequence, *param in records])
+		for card, (code, controller, location, sequence, *param) in zip(cards, records):
+			card.extra = param[0] if param else 0
 			res.append(card)
 		return res
 
 	def read_u8(self, buf):
-		return struct.unpack('b', buf.read(1))[0]
+		return buf.read_u8()
 
 	def read_u16(self, buf):
-		return struct.unpack('h', buf.read(2))[0]
+		return buf.read_u16()
 
 	def read_u32(self, buf):
-		return struct.unpack('I', buf.read(4))[0]
+		return buf.read_u32()
 
 	def set_responsei(self, r):
 		lib.set_responsei(self.duel, r)
+		self.field_cache.clear()
 		self.cm.call_callbacks('debug', event_type='set_responsei', response=r)
 
 	def set_responseb(self, r):
 		buf = ffi.new('char[64]', r)
 		lib.set_responseb(self.duel, ffi.cast('byte *', buf))
+		self.field_cache.clear()
 		self.cm.call_callbacks('debug', event_type='set_responseb', response=r.decode('latin1'))
 
-	def get_cards_in_location(self, player, location):
+	def count_cards(self, player, location):
+		return lib.query_field_count(self.duel, player, location)
+
+	def get_cards_in_location(self, player, location, profile=QUERY_PROFILE_FULL):
+		"""Returns the cards in a location.
+
+		profile is one of the QUERY_PROFILE_* flags, values it doesn't
+		include are those of the card database.
+		The cards are queried once between two steps of the core,
+		later calls get copies of the same list.
+		"""
+		# complete results serve every profile
+		cards = self.field_cache.get((player, location, QUERY_PROFILE_FULL))
+		if cards is None:
+			key = (player, location, profile)
+			cards = self.field_cache.get(key)
+			if cards is None:
+				if profile == QUERY_PROFILE_FULL:
+					cards = self.query_cards_in_location(player, location)
+				else:
+					cards = self.query_profile(player, location, profile)
+				self.field_cache[key] = cards
+		return cards[:]
+
+	def query_profile(self, player, location, profile):
+		"""Queries the cards in a location with only the values of profile."""
+		bl = lib.query_field_card(self.duel, player, location, profile, ffi.cast('byte *', self.buf), False)
+		if profile & ~QUERY_PROFILE_POSITION:
+			# the core remembers the values it sent, see get_card
+			self.query_state.pop((player, location), None)
+		buf = MessageReader(ffi.buffer(self.buf, bl))
+		cards = []
+		sequence = 0
+		while buf.pos < bl:
+			start = buf.pos
+			length = self.read_u32(buf)
+			if length > 4:
+				f = self.read_u32(buf)
+				card = Card(self.read_u32(buf), self.card_db)
+				if f & QUERY_POSITION:
+					card.set_location(self.read_u32(buf))
+				else:
+					card.set_location(player | location << 8 | sequence << 16)
+				if profile & QUERY_LEVEL:
+					values = [self.read_u32(buf) if f & flag else 0 for flag in CACHED_QUERIES]
+					link = buf.unpack(LINK_QUERY) if f & QUERY_LINK else (0, 0)
+					self.apply_query(card, *values, *link)
+				cards.append(card)
+			buf.pos = start + length
+			sequence += 1
+		return cards
+
+	def query_cards_in_location(self, player, location):
+		"""Queries the cards in a location from the core.
+
+		Once a location was queried, the core is asked to leave out the
+		values which didn't change since then, the cards of the previous
+		query are updated in place. If a card shows up whose values aren't
+		known, the location is queried completely.
+		"""
+		key = (player, location)
+		state = self.query_state.get(key)
+		use_cache = state is not None
+		bl = lib.query_field_card(self.duel, player, location, QUERY_PROFILE_FULL, ffi.cast('byte *', self.buf), use_cache)
+		# copied, since get_card reuses self.buf for equip targets
+		buf = MessageReader(ffi.unpack(self.buf, bl))
 		cards = []
-		flags = QUERY_CODE | QUERY_POSITION | QUERY_LEVEL | QUERY_RANK | QUERY_ATTACK | QUERY_DEFENSE | QUERY_EQUIP_CARD | QUERY_OVERLAY_CARD | QUERY_COUNTERS | QUERY_LINK
-		bl = lib.query_field_card(self.duel, player, location, flags, ffi.cast('byte *', self.buf), False)
-		buf = io.BytesIO(ffi.unpack(self.buf, bl))
-		while True:
-			if buf.tell() == bl:
-				break
+		new_state = []
+		while buf.pos < bl:
 			length = self.read_u32(buf)
 			if length == 4:
-				continue #No card here
-			f = self.read_u32(buf)
-			code = self.read_u32(buf)
-			card = Card(code)
-			position = self.read_u32(buf)
-			card.set_location(position)
-			level = self.read_u32(buf)
-			if (level & 0xff) > 0:
-				card.level = level & 0xff
-			rank = self.read_u32(buf)
-			if (rank & 0xff) > 0:
-				card.level = rank & 0xff
-			card.attack = self.read_u32(buf)
-			card.defense = self.read_u32(buf)
+				new_state.append(None) #No card here
+				continue
+			f, code, position = buf.unpack(FIELD_CARD_HEADER)
+			previous = state[len(new_state)] if use_cache and len(new_state) < len(state) else None
+			if previous is not None and previous[0].code == code:
+				card, values = previous[0], previous[1][:]
+			else:
+				card, values = Card(code, self.card_db), [None] * 6
+			for i, flag in enumerate(CACHED_QUERIES):
+				if f & flag:
+					values[i] = self.read_u32(buf)
 
 			card.equip_target = None
 
@@ -214,51 +372,82 @@ class Duel:
 			xyz = self.read_u32(buf)
 
 			for i in range(xyz):
-				card.xyz_materials.append(Card(self.read_u32(buf)))
+				card.xyz_materials.append(Card(self.read_u32(buf), self.card_db))
 
 			cs = self.read_u32(buf)
-			card.counters = []
-			for i in range(cs):
-				card.counters.append(self.read_u32(buf))
-
-			link = self.read_u32(buf)
-			link_marker = self.read_u32(buf)
+			card.counters = [c for c, in buf.unpack_records(U32, cs)]
 
-			if (link & 0xff) > 0:
-				card.level = link & 0xff
+			if f & QUERY_LINK:
+				values[4:6] = buf.unpack(LINK_QUERY)
 
-			if link_marker > 0:
-				card.defense = link_marker
+			if None in values:
+				self.query_state.pop(key, None)
+				return self.query_cards_in_location(player, location)
 
+			card.set_location(position)
+			self.apply_query(card, *values)
+			new_state.append((card, values))
 			cards.append(card)
+		self.query_state[key] = new_state
 		return cards
 
-	def get_card(self, player, loc, seq):
-		flags = QUERY_CODE | QUERY_ATTACK | QUERY_DEFENSE | QUERY_POSITION | QUERY_LEVEL | QUERY_RANK | QUERY_LINK
-		bl = lib.query_card(self.duel, player, loc, seq, flags, ffi.cast('byte *', self.buf), False)
-		buf = io.BytesIO(ffi.unpack(self.buf, bl))
-		f = self.read_u32(buf)
-		if f == 4:
-			return
-		f = self.read_u32(buf)
-		code = self.read_u32(buf)
-		card = Card(code)
-		position = self.read_u32(buf)
-		card.set_location(position)
-		level = self.read_u32(buf)
+	def apply_query(self, card, level, rank, attack, defense, link, link_marker):
+		card.level = card.data.level
 		if (level & 0xff) > 0:
 			card.level = level & 0xff
-		rank = self.read_u32(buf)
 		if (rank & 0xff) > 0:
 			card.level = rank & 0xff
-		card.attack = self.read_u32(buf)
-		card.defense = self.read_u32(buf)
-		link = self.read_u32(buf)
-		link_marker = self.read_u32(buf)
+		card.attack = attack
+		card.defense = defense
 		if (link & 0xff) > 0:
 			card.level = link & 0xff
 		if link_marker > 0:
 			card.defense = link_marker
+
+	def get_cards(self, places):
+		"""Returns the cards at a list of (player, location, sequence) places.
+
+		Every location is queried once for all its cards instead of
+		querying the cards one by one, the cards are copies as callers
+		store their own values on them. Copies only keep stats and place,
+		so the combat profile is all that's queried.
+		"""
+		locations = {}
+		for player, loc, seq in places:
+			if not loc & LOCATION_OVERLAY and (player, loc) not in locations:
+				cards = self.get_cards_in_location(player, loc, QUERY_PROFILE_COMBAT)
+				locations[(player, loc)] = {card.sequence: card for card in cards}
+		cards = []
+		for player, loc, seq in places:
+			card = locations.get((player, loc), {}).get(seq)
+			if card is None:
+				card = self.get_card(player, loc, seq)
+			else:
+				card = card.copy()
+			cards.append(card)
+		return cards
+
+	def find_card(self, player, loc, seq):
+		"""Returns a card from the field mirror, querying the core for places it doesn't know."""
+		card = self.field.get_card(player, loc, seq)
+		if card is None:
+			card = self.get_card(player, loc, seq)
+		return card
+
+	def get_card(self, player, loc, seq):
+		flags = QUERY_CODE | QUERY_ATTACK | QUERY_DEFENSE | QUERY_POSITION | QUERY_LEVEL | QUERY_RANK | QUERY_LINK
+		bl = lib.query_card(self.duel, player, loc, seq, flags, ffi.cast('byte *', self.buf), False)
+		# the core remembers the values it sent for this card as well,
+		# so the next field query of this location could leave them out
+		self.query_state.pop((player, loc), None)
+		buf = MessageReader(ffi.buffer(self.buf, bl))
+		f = self.read_u32(buf)
+		if f == 4:
+			return
+		f, code, position, level, rank, attack, defense, link, link_marker = buf.unpack(CARD_QUERY)
+		card = Card(code, self.card_db)
+		card.set_location(position)
+		self.apply_query(card, level, rank, attack, defense, link, link_marker)
 		return card
 
 	def unpack_location(self, loc):
@@ -268,16 +457,22 @@ class Duel:
 		position = (loc >> 24) & 0xff
 		return (controller, location, sequence, position)
 
-	# all modules in ygo.message_handlers package will be imported here
+	def bind_message_handlers(self):
+		for c, callback in self.callback_map.items():
+			self.cm.register_callback(c, callback.__get__(self))
+
+	# all modules in ygo.message_handlers package will be imported here,
+	# once when this module is imported
 	# if a module contains a MESSAGES dictionary attribute,
 	# all of those entries will be considered message handlers
 	# if a module contains a CALLBACKS dictionary attribute,
 	# all of those entries will be considered callbacks for message handlers
-	# all methods mentioned in those dictionaries will be linked into
-	# the Duel object, same goes for all additional methods mentioned
+	# all functions mentioned in those dictionaries will be linked into
+	# the Duel class, same goes for all additional methods mentioned
 	# in an additional METHODS dictionary attribute
 
-	def bind_message_handlers(self):
+	@classmethod
+	def load_message_handlers(cls):
 
 		all_handlers = {}
 
@@ -288,7 +483,7 @@ class Duel:
 		for importer, modname, ispkg in pkgutil.iter_modules(message_handlers.__path__):
 			if not ispkg:
 				try:
-					m = importer.find_module(modname).load_module(modname)
+					m = importlib.import_module(message_handlers.__name__ + '.' + modname)
 					# check if we got message handlers registered in there
 					handlers = m.__dict__.get('MESSAGES')
 					if type(handlers) is dict:
@@ -308,17 +503,15 @@ class Duel:
 					print("Error loading message handler", modname)
 					print(e)
 
-		# link all those methods into this object
+		# link all those functions into this class
 		for h in all_handlers.keys():
-			m = all_handlers[h].__get__(self)
-			setattr(self, all_handlers[h].__name__, m)
-			self.message_map[h] = m
+			setattr(cls, all_handlers[h].__name__, all_handlers[h])
 		for c in all_callbacks.keys():
-			m = all_callbacks[c].__get__(self)
-			setattr(self, all_callbacks[c].__name__, m)
-			self.cm.register_callback(c, m)
+			setattr(cls, all_callbacks[c].__name__, all_callbacks[c])
 		for n in all_methods.keys():
-			setattr(self, n, all_methods[n].__get__(self))
+			setattr(cls, n, all_methods[n])
+		cls.message_map = all_handlers
+		cls.callback_map = all_callbacks
 
 	def show_usable(self, pl):
 		summonable = natsort.natsorted([card.get_spec(pl.duel_player) for card in self.summonable])
@@ -455,7 +648,7 @@ class Duel:
 				pl.notify(pl._("Zone linked by %s (%s): %s")%(card.get_name(pl), card.get_spec(player), zone))
 
 	def show_cards_in_location(self, pl, player, location, hide_facedown=False):
-		cards = self.get_cards_in_location(player, location)
+		cards = self.get_cards_in_location(player, location, QUERY_PROFILE_COMBAT)
 		if not cards:
 			pl.notify(pl._("Table is empty."))
 			return
@@ -471,7 +664,7 @@ class Duel:
 			pl.notify(s)
 
 	def show_hand(self, pl, player):
-		h = self.get_cards_in_location(player, LOCATION_HAND)
+		h = self.get_cards_in_location(player, LOCATION_HAND, QUERY_PROFILE_IDENTITY)
 		if not h:
 			pl.notify(pl._("Your hand is empty."))
 			return
@@ -480,28 +673,28 @@ class Duel:
 
 	def show_score(self, pl):
 		player = pl.duel_player
-		deck = self.get_cards_in_location(player, LOCATION_DECK)
-		odeck = self.get_cards_in_location(1 - player, LOCATION_DECK)
-		grave = self.get_cards_in_location(player, LOCATION_GRAVE)
-		ograve = self.get_cards_in_location(1 - player, LOCATION_GRAVE)
-		hand = self.get_cards_in_location(player, LOCATION_HAND)
-		ohand = self.get_cards_in_location(1 - player, LOCATION_HAND)
-		removed = self.get_cards_in_location(player, LOCATION_REMOVED)
-		oremoved = self.get_cards_in_location(1 - player, LOCATION_REMOVED)
+		deck = self.count_cards(player, LOCATION_DECK)
+		odeck = self.count_cards(1 - player, LOCATION_DECK)
+		grave = self.count_cards(player, LOCATION_GRAVE)
+		ograve = self.count_cards(1 - player, LOCATION_GRAVE)
+		hand = self.count_cards(player, LOCATION_HAND)
+		ohand = self.count_cards(1 - player, LOCATION_HAND)
+		removed = self.count_cards(player, LOCATION_REMOVED)
+		oremoved = self.count_cards(1 - player, LOCATION_REMOVED)
 		if pl.watching:
 			nick0 = self.players[0].nickname
 			nick1 = self.players[1].nickname
 			pl.notify(pl._("LP: %s: %d %s: %d") % (nick0, self.lp[player], nick1, self.lp[1 - player]))
-			pl.notify(pl._("Hand: %s: %d %s: %d") % (nick0, len(hand), nick1, len(ohand)))
-			pl.notify(pl._("Deck: %s: %d %s: %d") % (nick0, len(deck), nick1, len(odeck)))
-			pl.notify(pl._("Grave: %s: %d %s: %d") % (nick0, len(grave), nick1, len(ograve)))
-			pl.notify(pl._("Removed: %s: %d %s: %d") % (nick0, len(removed), nick1, len(oremoved)))
+			pl.notify(pl._("Hand: %s: %d %s: %d") % (nick0, hand, nick1, ohand))
+			pl.notify(pl._("Deck: %s: %d %s: %d") % (nick0, deck, nick1, odeck))
+			pl.notify(pl._("Grave: %s: %d %s: %d") % (nick0, grave, nick1, ograve))
+			pl.notify(pl._("Removed: %s: %d %s: %d") % (nick0, removed, nick1, oremoved))
 		else:
 			pl.notify(pl._("Your LP: %d Opponent LP: %d") % (self.lp[player], self.lp[1 - player]))
-			pl.notify(pl._("Hand: You: %d Opponent: %d") % (len(hand), len(ohand)))
-			pl.notify(pl._("Deck: You: %d Opponent: %d") % (len(deck), len(odeck)))
-			pl.notify(pl._("Grave: You: %d Opponent: %d") % (len(grave), len(ograve)))
-			pl.notify(pl._("Removed: You: %d Opponent: %d") % (len(removed), len(oremoved)))
+			pl.notify(pl._("Hand: You: %d Opponent: %d") % (hand, ohand))
+			pl.notify(pl._("Deck: You: %d Opponent: %d") % (deck, odeck))
+			pl.notify(pl._("Grave: You: %d Opponent: %d") % (grave, ograve))
+			pl.notify(pl._("Removed: You: %d Opponent: %d") % (removed, oremoved))
 		if self.paused:
 			pl.notify(pl._("This duel is currently paused."))
 		else:
@@ -513,7 +706,7 @@ class Duel:
 	def show_info(self, card, pl):
 		pln = pl.duel_player
 		cs = card.get_spec(pln)
-		if card.position in (0x8, 0xa) and (pl.watching or card in self.get_cards_in_location(1 - pln, LOCATION_MZONE) + self.get_cards_in_location(1 - pln, LOCATION_SZONE)):
+		if card.position in (0x8, 0xa) and (pl.watching or card in self.get_cards_in_location(1 - pln, LOCATION_MZONE, QUERY_PROFILE_IDENTITY) + self.get_cards_in_location(1 - pln, LOCATION_SZONE, QUERY_PROFILE_IDENTITY)):
 			pl.notify(pl._("%s: %s card.") % (cs, card.get_position(pl)))
 			return
 		pl.notify(card.get_info(pl))
@@ -622,3 +815,5 @@ class Duel:
 	@property
 	def paused(self):
 		return len(self.players) != len([p for p in self.players if p.connection is not None])
+
+Duel.load_message_handlers()
@@ -0,0 +1,320 @@
+from .card import Card
+from .constants import *
+
+# locations followed message by message, the order of the deck and the
+# extra deck isn't known after they were shuffled, so those are queried
+TRACKED_LOCATIONS = (LOCATION_HAND, LOCATION_MZONE, LOCATION_SZONE, LOCATION_GRAVE, LOCATION_REMOVED)
+# locations with a fixed slot per sequence, the others are ordered lists
+ZONES = (LOCATION_MZONE, LOCATION_SZONE)
+
+def unpack_location(location):
+	return location & 0xff, (location >> 8) & 0xff, (location >> 16) & 0xff, (location >> 24) & 0xff
+
+class Field(object):
+	"""Mirror of the duel field, updated from the messages of the core.
+
+	Handlers look up cards here instead of querying the core for places
+	the messages already described. A location is None while its content
+	isn't known, e.g. after a message the mirror can't follow, and is
+	queried from the core the next time it is read.
+	While messages are handled the core is already past all of them, so
+	locations queried then are left alone by the remaining messages.
+	Cards carry their code, place, xyz materials, counters and equip
+	target, attack, defense and level stay those of the card database.
+	"""
+
+	def __init__(self, duel):
+		self.duel = duel
+		self.locations = {}
+		for player in (0, 1):
+			for location in TRACKED_LOCATIONS:
+				self.locations[(player, location)] = self.empty(location)
+		self.handling = False
+		# locations queried while messages are handled
+		self.synced = set()
+
+	def empty(self, location):
+		return {} if location in ZONES else []
+
+	def register(self, cm):
+		cm.register_callback('move', self.move)
+		cm.register_callback('draw', self.draw)
+		cm.register_callback('shuffle_hand', self.shuffle_hand)
+		cm.register_callback('swap_grave_deck', self.swap_grave_deck)
+		cm.register_callback('pos_change', self.pos_change)
+		cm.register_callback('set', self.set)
+		cm.register_callback('swap', self.swap)
+		cm.register_callback('equip', self.equip)
+		cm.register_callback('unequip', self.unequip)
+		cm.register_callback('counters', self.counters)
+
+	def begin_messages(self):
+		self.handling = True
+		self.synced.clear()
+
+	def end_messages(self):
+		self.handling = False
+		self.synced.clear()
+
+	def new_card(self, code):
+		card = Card(code, self.duel.card_db)
+		card.xyz_materials = []
+		card.counters = []
+		card.equip_target = None
+		return card
+
+	def values(self, cards):
+		if isinstance(cards, dict):
+			return [cards[s] for s in sorted(cards)]
+		return cards
+
+	def find(self, cards, location, sequence):
+		if location in ZONES:
+			return cards.get(sequence)
+		if sequence < len(cards):
+			return cards[sequence]
+
+	def get_card(self, player, location, sequence):
+		"""Returns the card at a place, None if there is none or the location isn't tracked."""
+		key = (player, location)
+		if key not in self.locations:
+			return
+		cards = self.locations[key]
+		if cards is None:
+			cards = self.rebuild(player, location)
+		return self.find(cards, location, sequence)
+
+	def known(self, player, location):
+		"""Returns the cards of a location messages still apply to, None otherwise."""
+		key = (player, location)
+		if key in self.synced:
+			return
+		return self.locations.get(key)
+
+	def known_card(self, player, location, sequence):
+		cards = self.known(player, location)
+		if cards is None:
+			return
+		return self.find(cards, location, sequence)
+
+	def invalidate(self, player=None, location=None):
+		"""Forgets a location, all of them if none is given."""
+		for key in self.locations:
+			if player is None or key == (player, location):
+				self.locations[key] = None
+				self.synced.discard(key)
+
+	def renumber(self, cards):
+		for i, card in enumerate(cards):
+			card.sequence = i
+
+	def take(self, location):
+		"""Removes the card at a location value from the mirror and returns it."""
+		c, l, s, p = unpack_location(location)
+		if l & LOCATION_OVERLAY:
+			xyz = self.known_card(c, l & ~LOCATION_OVERLAY, s)
+			if xyz is not None and p < len(xyz.xyz_materials):
+				return xyz.xyz_materials.pop(p)
+			return
+		cards = self.known(c, l)
+		if cards is None:
+			return
+		if l in ZONES:
+			return cards.pop(s, None)
+		if s < len(cards):
+			card = cards.pop(s)
+			self.renumber(cards)
+			return card
+		self.invalidate(c, l)
+
+	def put(self, card, location):
+		"""Places a card at a location value."""
+		c, l, s, p = unpack_location(location)
+		if l & LOCATION_OVERLAY:
+			xyz = self.known_card(c, l & ~LOCATION_OVERLAY, s)
+			if xyz is not None:
+				card.set_location(location)
+				xyz.xyz_materials.insert(p, card)
+			return
+		cards = self.known(c, l)
+		if cards is None:
+			return
+		card.set_location(location)
+		if l in ZONES:
+			cards[s] = card
+		elif s <= len(cards):
+			cards.insert(s, card)
+			self.renumber(cards)
+		else:
+			self.invalidate(c, l)
+
+	def move(self, code, location, newloc, reason):
+		card = self.take(location) if location else None
+		ploc = (location >> 8) & 0xff
+		pnewloc = (newloc >> 8) & 0xff
+		# only cards moving between zones keep their state
+		if card is None or card.code != code or ploc not in ZONES or pnewloc != ploc:
+			if card is not None:
+				self.unequip_all(card)
+				if card.code != code:
+					self.invalidate(card.controller, card.location)
+			card = self.new_card(code)
+		if not newloc:
+			return
+		self.put(card, newloc)
+		if pnewloc in ZONES and ploc not in ZONES and card.type & TYPE_XYZ:
+			# materials are attached before the monster is summoned
+			self.invalidate(newloc & 0xff, pnewloc)
+
+	def draw(self, player, cards):
+		hand = self.known(player, LOCATION_HAND)
+		if hand is None:
+			return
+		for c in cards:
+			card = self.new_card(c.code)
+			card.set_location(player | LOCATION_HAND << 8 | len(hand) << 16 | POS_FACEDOWN << 24)
+			hand.append(card)
+
+	def shuffle_hand(self, player, codes):
+		hand = self.known(player, LOCATION_HAND)
+		if hand is None:
+			return
+		if sorted(c.code for c in hand) != sorted(codes):
+			self.invalidate(player, LOCATION_HAND)
+			return
+		cards = {}
+		for card in hand:
+			cards.setdefault(card.code, []).append(card)
+		hand[:] = [cards[code].pop() for code in codes]
+		self.renumber(hand)
+
+	def swap_grave_deck(self, player):
+		self.invalidate(player, LOCATION_GRAVE)
+
+	def locate(self, card):
+		"""Returns the mirrored card at the place of a card from a message."""
+		mirrored = self.known_card(card.controller, card.location, card.sequence)
+		if mirrored is None or mirrored.code != card.code:
+			return
+		return mirrored
+
+	def pos_change(self, card, prevpos):
+		mirrored = self.locate(card)
+		if mirrored is None:
+			if self.known(card.controller, card.location) is not None:
+				self.invalidate(card.controller, card.location)
+			return
+		mirrored.position = card.position
+
+	def set(self, card):
+		mirrored = self.locate(card)
+		if mirrored is not None:
+			mirrored.position = card.position
+
+	def swap(self, card1, card2):
+		# both cards change controller, the core queries are authoritative
+		for card in (card1, card2):
+			self.invalidate(card.controller, card.location)
+			self.invalidate(1 - card.controller, card.location)
+
+	def equip(self, card, target):
+		mirrored = self.locate(card)
+		if mirrored is not None:
+			mirrored.equip_target = self.locate(target) if target else None
+
+	def unequip(self, card):
+		mirrored = self.locate(card)
+		if mirrored is not None:
+			mirrored.equip_target = None
+
+	def unequip_all(self, target):
+		"""Drops the equip target of all cards equipped to a card leaving its place."""
+		for cards in self.locations.values():
+			if cards is None:
+				continue
+			for card in self.values(cards):
+				if card.equip_target is target:
+					card.equip_target = None
+
+	def counters(self, card, ctype, count, added):
+		mirrored = self.locate(card)
+		if mirrored is None:
+			return
+		# stored like query results, counter type and amount in one value
+		current = {c & 0xffff: (c >> 16) & 0xffff for c in mirrored.counters}
+		if added:
+			current[ctype] = current.get(ctype, 0) + count
+		else:
+			current[ctype] = max(current.get(ctype, 0) - count, 0)
+		mirrored.counters = [t | n << 16 for t, n in current.items() if n > 0]
+
+	def query(self, player, location):
+		"""Returns the content of a location as the core reports it.
+
+		Equip targets are the cards returned by the core,
+		rebuild replaces them with mirrored ones.
+		"""
+		cards = self.empty(location)
+		for queried in self.duel.get_cards_in_location(player, location):
+			# copied, as the query results are updated in place by later queries
+			card = self.new_card(queried.code)
+			card.set_location(player | location << 8 | queried.sequence << 16 | queried.position << 24)
+			card.counters = queried.counters[:]
+			card.xyz_materials = [self.new_card(c.code) for c in queried.xyz_materials]
+			card.equip_target = queried.equip_target
+			if location in ZONES:
+				cards[queried.sequence] = card
+			else:
+				cards.append(card)
+		if location not in ZONES:
+			self.renumber(cards)
+		return cards
+
+	def rebuild(self, player, location):
+		"""Replaces a location with its content queried from the core."""
+		key = (player, location)
+		cards = self.query(player, location)
+		self.locations[key] = cards
+		if self.handling:
+			self.synced.add(key)
+		for card in self.values(cards):
+			target = card.equip_target
+			if target is not None:
+				card.equip_target = self.get_card(target.controller, target.location, target.sequence)
+		# cards elsewhere equipped to the previous content of this location
+		for other_key, other in self.locations.items():
+			if other is None or other_key == key:
+				continue
+			for card in self.values(other):
+				target = card.equip_target
+				if target is not None and (target.controller, target.location) == key:
+					found = self.find(cards, location, target.sequence)
+					card.equip_target = found if found is not None and found.code == target.code else None
+		return cards
+
+	def describe(self, location, cards):
+		if cards is None:
+			return None
+		res = []
+		for card in self.values(cards):
+			target = card.equip_target
+			equip = (target.controller, target.location, target.sequence) if target is not None else None
+			state = (card.sequence, card.code, sorted(card.counters), equip)
+			# positions and materials only matter on the field
+			if location in ZONES:
+				state += (card.position, len(card.xyz_materials))
+			res.append(state)
+		return res
+
+	def verify(self):
+		"""Compares every known location with the core, prints and fixes differences."""
+		differences = 0
+		for (player, location), cards in list(self.locations.items()):
+			if cards is None:
+				continue
+			queried = self.query(player, location)
+			if self.describe(location, cards) != self.describe(location, queried):
+				print("field mirror differs for player %d location %d: %r, core: %r" % (player, location, self.describe(location, cards), self.describe(location, queried)))
+				self.rebuild(player, location)
+				differences += 1
+		return differences
@@ -1,23 +1,17 @@
 import gettext
 import re
 
-from . import globals
-
 def set_language(pl, language):
 	if language == 'en':
-		pl.cdb = globals.server.db
 		pl._ = gettext.NullTranslations().gettext
 		pl.language = 'en'
 	elif language == 'de':
-		pl.cdb = globals.german_db
 		pl._ = gettext.translation('game', 'locale', languages=['de'], fallback=True).gettext
 		pl.language = 'de'
 	elif language == 'ja':
-		pl.cdb = globals.japanese_db
 		pl._ = gettext.translation('game', 'locale', languages=['ja'], fallback=True).gettext
 		pl.language = 'ja'
 	elif language == 'es':
-		pl.cdb = globals.spanish_db
 		pl._ = gettext.translation('game', 'locale', languages=['es'], fallback=True).gettext
 		pl.language = 'es'
 
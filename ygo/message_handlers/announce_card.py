@@ -1,17 +1,17 @@
 from gsb.intercept import Reader
-import io
 from twisted.internet import reactor
 
+from ygo.message_reader import MessageReader
 from ygo.parsers.duel_parser import DuelParser
 from ygo.utils import process_duel
 from ygo import globals
 
 def msg_announce_card(self, data):
-	data = io.BytesIO(data[1:])
+	data = MessageReader(data, 1)
 	player = self.read_u8(data)
 	type = self.read_u32(data)
 	self.cm.call_callbacks('announce_card', player, type)
-	return data.read()
+	return data.pos
 
 def announce_card(self, player, type):
 	pl = self.players[player]
@@ -22,7 +22,7 @@ def announce_card(self, player, type):
 		pl.notify(text)
 		return prompt()
 	def r(caller):
-		card = globals.server.get_card_by_name(pl, caller.text)
+		card = globals.server.get_card_by_name(pl, caller.text, self.card_db)
 		if card is None:
 			return error(pl._("No results found."))
 		if not card.type & type:
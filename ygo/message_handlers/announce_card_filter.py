@@ -1,21 +1,21 @@
 from gsb.intercept import Reader
-import io
 from twisted.internet import reactor
 
+from ygo.message_reader import MessageReader
 from ygo.parsers.duel_parser import DuelParser
 from ygo.utils import process_duel
 from ygo import globals
 from ygo import duel
 
 def msg_announce_card_filter(self, data):
-	data = io.BytesIO(data[1:])
+	data = MessageReader(data, 1)
 	player = self.read_u8(data)
 	size = self.read_u8(data)
 	options = []
 	for i in range(size):
 		options.append(self.read_u32(data))
 	self.cm.call_callbacks('announce_card_filter', player, options)
-	return data.read()
+	return data.pos
 
 def announce_card_filter(self, player, options):
 	pl = self.players[player]
@@ -26,10 +26,12 @@ def announce_card_filter(self, player, options):
 		pl.notify(text)
 		return prompt()
 	def r(caller):
-		card = globals.server.get_card_by_name(pl, caller.text)
+		card = globals.server.get_card_by_name(pl, caller.text, self.card_db)
 		if card is None:
 			return error(pl._("No results found."))
 		cd = duel.ffi.new('struct card_data *')
+		# the card reader uses the card database of the duel it was last set for
+		self.use_card_db()
 		duel.card_reader_callback(card.code, cd)
 		if not duel.lib.declarable(cd, len(options), options):
 			return error(pl._("Wrong type."))
@@ -1,18 +1,18 @@
-import io
 from twisted.internet import reactor
 
 from ygo.constants import RACES
 from ygo.duel_reader import DuelReader
+from ygo.message_reader import MessageReader
 from ygo.parsers.duel_parser import DuelParser
 from ygo.utils import process_duel
 
 def msg_announce_race(self, data):
-	data = io.BytesIO(data[1:])
+	data = MessageReader(data, 1)
 	player = self.read_u8(data)
 	count = self.read_u8(data)
 	avail = self.read_u32(data)
 	self.cm.call_callbacks('announce_race', player, count, avail)
-	return data.read()
+	return data.pos
 
 def announce_race(self, player, count, avail):
 	racemap = {k: (1<<i) for i, k in enumerate(RACES)}
@@ -1,7 +1,7 @@
-import io
+from ygo.message_reader import MessageReader
 
 def msg_attack(self, data):
-	data = io.BytesIO(data[1:])
+	data = MessageReader(data, 1)
 	attacker = self.read_u32(data)
 	ac = attacker & 0xff
 	al = (attacker >> 8) & 0xff
@@ -13,10 +13,10 @@ def msg_attack(self, data):
 	tseq = (target >> 16) & 0xff
 	tpos = (target >> 24) & 0xff
 	self.cm.call_callbacks('attack', ac, al, aseq, apos, tc, tl, tseq, tpos)
-	return data.read()
+	return data.pos
 
 def attack(self, ac, al, aseq, apos, tc, tl, tseq, tpos):
-	acard = self.get_card(ac, al, aseq)
+	acard = self.find_card(ac, al, aseq)
 	if not acard:
 		return
 	name = self.players[ac].nickname
@@ -25,7 +25,7 @@ def attack(self, ac, al, aseq, apos, tc, tl, tseq, tpos):
 			aspec = acard.get_spec(pl.duel_player)
 			pl.notify(pl._("%s prepares to attack with %s (%s)") % (name, aspec, acard.get_name(pl)))
 		return
-	tcard = self.get_card(tc, tl, tseq)
+	tcard = self.find_card(tc, tl, tseq)
 	if not tcard:
 		return
 	for pl in self.players + self.watchers:
@@ -36,6 +36,9 @@ def attack(self, ac, al, aseq, apos, tc, tl, tseq, tpos):
 			tcname = pl._("%s card") % tcard.get_position(pl)
 		pl.notify(pl._("%s prepares to attack %s (%s) with %s (%s)") % (name, tspec, tcname, aspec, acard.get_name(pl)))
 
-MESSAGES = {110: msg_attack}
+def msg_attack_disabled(self, data):
+	return 1
+
+MESSAGES = {110: msg_attack, 112: msg_attack_disabled}
 
 CALLBACKS = {'attack': attack}
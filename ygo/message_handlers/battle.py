@@ -1,9 +1,8 @@
-import io
-
 from ygo.constants import TYPE_LINK
+from ygo.message_reader import MessageReader
 
 def msg_battle(self, data):
-	data = io.BytesIO(data[1:])
+	data = MessageReader(data, 1)
 	attacker = self.read_u32(data)
 	aa = self.read_u32(data)
 	ad = self.read_u32(data)
@@ -13,18 +12,18 @@ def msg_battle(self, data):
 	dd = self.read_u32(data)
 	bd1 = self.read_u8(data)
 	self.cm.call_callbacks('battle', attacker, aa, ad, bd0, tloc, da, dd, bd1)
-	return data.read()
+	return data.pos
 
 def battle(self, attacker, aa, ad, bd0, tloc, da, dd, bd1):
 	loc = (attacker >> 8) & 0xff
 	seq = (attacker >> 16) & 0xff
 	c2 = attacker & 0xff
-	card = self.get_card(c2, loc, seq)
+	card = self.find_card(c2, loc, seq)
 	tc = tloc & 0xff
 	tl = (tloc >> 8) & 0xff
 	tseq = (tloc >> 16) & 0xff
 	if tloc:
-		target = self.get_card(tc, tl, tseq)
+		target = self.find_card(tc, tl, tseq)
 	else:
 		target = None
 	for pl in self.players + self.watchers:
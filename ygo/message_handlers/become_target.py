@@ -1,7 +1,7 @@
-import io
+from ygo.message_reader import MessageReader
 
 def msg_become_target(self, data):
-	data = io.BytesIO(data[1:])
+	data = MessageReader(data, 1)
 	u = self.read_u8(data)
 	target = self.read_u32(data)
 	tc = target & 0xff
@@ -9,10 +9,10 @@ def msg_become_target(self, data):
 	tseq = (target >> 16) & 0xff
 	tpos = (target >> 24) & 0xff
 	self.cm.call_callbacks('become_target', tc, tl, tseq)
-	return data.read()
+	return data.pos
 
 def become_target(self, tc, tl, tseq):
-	card = self.get_card(tc, tl, tseq)
+	card = self.find_card(tc, tl, tseq)
 	if not card:
 		return
 	name = self.players[self.chaining_player].nickname
@@ -23,6 +23,13 @@ def become_target(self, tc, tl, tseq):
 			tcname = pl._("%s card") % card.get_position(pl)
 		pl.notify(pl._("%s targets %s (%s)") % (name, spec, tcname))
 
-MESSAGES = {83: msg_become_target}
+def msg_card_target(self, data):
+	# card target and cancel target: locations of the card and its target
+	data = MessageReader(data, 1)
+	location = self.read_u32(data)
+	target = self.read_u32(data)
+	return data.pos
+
+MESSAGES = {83: msg_become_target, 96: msg_card_target, 97: msg_card_target}
 
 CALLBACKS = {'become_target': become_target}
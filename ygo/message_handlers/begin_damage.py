@@ -1,6 +1,6 @@
 def msg_begin_damage(self, data):
 	self.cm.call_callbacks('begin_damage')
-	return data[1:]
+	return 1
 
 def begin_damage(self):
 	for pl in self.players + self.watchers:
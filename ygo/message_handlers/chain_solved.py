@@ -1,10 +1,10 @@
-import io
+from ygo.message_reader import MessageReader
 
 def msg_chain_solved(self, data):
-	data = io.BytesIO(data[1:])
+	data = MessageReader(data, 1)
 	count = self.read_u8(data)
 	self.cm.call_callbacks('chain_solved', count)
-	return data.read()
+	return data.pos
 
 def chain_solved(self, count):
 	self.revealed = {}
@@ -1,19 +1,19 @@
-import io
+import struct
 
 from ygo.card import Card
+from ygo.message_reader import MessageReader
+
+# code, location, controller, location and sequence of the activated card,
+# effect description, chain count
+CHAINING = struct.Struct('=2I3bIb')
 
 def msg_chaining(self, data):
-	data = io.BytesIO(data[1:])
-	code = self.read_u32(data)
-	card = Card(code)
-	card.set_location(self.read_u32(data))
-	tc = self.read_u8(data)
-	tl = self.read_u8(data)
-	ts = self.read_u8(data)
-	desc = self.read_u32(data)
-	cs = self.read_u8(data)
+	data = MessageReader(data, 1)
+	code, location, tc, tl, ts, desc, cs = data.unpack(CHAINING)
+	card = Card(code, self.card_db)
+	card.set_location(location)
 	self.cm.call_callbacks('chaining', card, tc, tl, ts, desc, cs)
-	return data.read()
+	return data.pos
 
 def chaining(self, card, tc, tl, ts, desc, cs):
 	c = card.controller
@@ -42,6 +42,22 @@ def chaining(self, card, tc, tl, ts, desc, cs):
 				pl.notify("### activate_trap")
 		pl.notify(pl._("%s activating %s") % (n, card.get_name(pl)))
 
-MESSAGES = {70: msg_chaining}
+def msg_chain_count(self, data):
+	# chained, chain solving, chain negated and chain disabled
+	# only carry the number of the chain link
+	data = MessageReader(data, 1)
+	self.read_u8(data)
+	return data.pos
+
+def msg_chain_end(self, data):
+	return 1
+
+def msg_missed_effect(self, data):
+	data = MessageReader(data, 1)
+	location = self.read_u32(data)
+	code = self.read_u32(data)
+	return data.pos
+
+MESSAGES = {70: msg_chaining, 71: msg_chain_count, 72: msg_chain_count, 74: msg_chain_end, 75: msg_chain_count, 76: msg_chain_count, 120: msg_missed_effect}
 
 CALLBACKS = {'chaining': chaining}
@@ -1,19 +1,18 @@
-import io
+import struct
+
+from ygo.message_reader import MessageReader
+
+# player, amount of cards
+HEADER = struct.Struct('=2b')
+# code, controller, location, sequence
+CARD = struct.Struct('=I3b')
 
 def msg_confirm_cards(self, data):
-	data = io.BytesIO(data[1:])
-	player = self.read_u8(data)
-	size = self.read_u8(data)
-	cards = []
-	for i in range(size):
-		code = self.read_u32(data)
-		c = self.read_u8(data)
-		l = self.read_u8(data)
-		s = self.read_u8(data)
-		card = self.get_card(c, l, s)
-		cards.append(card)
+	data = MessageReader(data, 1)
+	player, size = data.unpack(HEADER)
+	cards = [self.find_card(c, l, s) for code, c, l, s in data.unpack_records(CARD, size)]
 	self.cm.call_callbacks('confirm_cards', player, cards)
-	return data.read()
+	return data.pos
 
 def confirm_cards(self, player, cards):
 	pl = self.players[player]
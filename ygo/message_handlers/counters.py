@@ -1,9 +1,8 @@
-import io
-
 from ygo import globals
+from ygo.message_reader import MessageReader
 
 def msg_counters(self, data):
-	data = io.BytesIO(data[0:])
+	data = MessageReader(data)
 
 	msg = self.read_u8(data)
 
@@ -17,11 +16,11 @@ def msg_counters(self, data):
 
 	count = self.read_u16(data)
 
-	card = self.get_card(pl, loc, seq)
+	card = self.find_card(pl, loc, seq)
 
 	self.cm.call_callbacks('counters', card, ctype, count, msg==101)
 			
-	return data.read()
+	return data.pos
 
 def counters(self, card, type, count, added):
 
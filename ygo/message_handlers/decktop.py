@@ -1,16 +1,15 @@
-import io
-
 from ygo.card import Card
+from ygo.message_reader import MessageReader
 
 def msg_decktop(self, data):
-	data = io.BytesIO(data[1:])
+	data = MessageReader(data, 1)
 	player = self.read_u8(data)
 	self.read_u8(data) # don't know what this number does
 	code = self.read_u32(data)
 	if code & 0x80000000:
 		code = code ^ 0x80000000 # don't know what this actually does
-	self.cm.call_callbacks('decktop', player, Card(code))
-	return data.read()
+	self.cm.call_callbacks('decktop', player, Card(code, self.card_db))
+	return data.pos
 
 def decktop(self, player, card):
 	player = self.players[player]
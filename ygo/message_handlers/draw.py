@@ -1,18 +1,18 @@
-import io
+import struct
 
 from ygo.card import Card
+from ygo.message_reader import MessageReader
+
+# player, amount of cards
+HEADER = struct.Struct('=2b')
+CODE = struct.Struct('=I')
 
 def msg_draw(self, data):
-	data = io.BytesIO(data[1:])
-	player = self.read_u8(data)
-	drawed = self.read_u8(data)
-	cards = []
-	for i in range(drawed):
-		c = self.read_u32(data)
-		card = Card(c & 0x7fffffff)
-		cards.append(card)
+	data = MessageReader(data, 1)
+	player, drawed = data.unpack(HEADER)
+	cards = [Card(c & 0x7fffffff, self.card_db) for c, in data.unpack_records(CODE, drawed)]
 	self.cm.call_callbacks('draw', player, cards)
-	return data.read()
+	return data.pos
 
 def draw(self, player, cards):
 	pl = self.players[player]
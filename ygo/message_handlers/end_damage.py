@@ -1,6 +1,6 @@
 def msg_end_damage(self, data):
 	self.cm.call_callbacks('end_damage')
-	return data[1:]
+	return 1
 
 def end_damage(self):
 	for pl in self.players + self.watchers:
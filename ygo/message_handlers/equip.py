@@ -1,15 +1,15 @@
-import io
+from ygo.message_reader import MessageReader
 
 def msg_equip(self, data):
-	data = io.BytesIO(data[1:])
+	data = MessageReader(data, 1)
 	loc = self.read_u32(data)
 	target = self.read_u32(data)
 	u = self.unpack_location(loc)
-	card = self.get_card(u[0], u[1], u[2])
+	card = self.find_card(u[0], u[1], u[2])
 	u = self.unpack_location(target)
-	target = self.get_card(u[0], u[1], u[2])
+	target = self.find_card(u[0], u[1], u[2])
 	self.cm.call_callbacks('equip', card, target)
-	return data.read()
+	return data.pos
 
 def equip(self, card, target):
 	for pl in self.players + self.watchers:
@@ -18,6 +18,14 @@ def equip(self, card, target):
 		pl.notify(pl._("{card} equipped to {target}.")
 			.format(card=c, target=t))
 
-MESSAGES = {93: msg_equip}
+def msg_unequip(self, data):
+	data = MessageReader(data, 1)
+	u = self.unpack_location(self.read_u32(data))
+	card = self.find_card(u[0], u[1], u[2])
+	if card:
+		self.cm.call_callbacks('unequip', card)
+	return data.pos
+
+MESSAGES = {93: msg_equip, 95: msg_unequip}
 
 CALLBACKS = {'equip': equip}
@@ -1,10 +1,10 @@
-import io
+from ygo.message_reader import MessageReader
 
 def msg_field_disabled(self, data):
-	data = io.BytesIO(data[1:])
+	data = MessageReader(data, 1)
 	locations = self.read_u32(data)
 	self.cm.call_callbacks('field_disabled', locations)
-	return data.read()
+	return data.pos
 
 def field_disabled(self, locations):
 	specs = self.flag_to_usable_cardspecs(locations, reverse=True)
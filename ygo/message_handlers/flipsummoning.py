@@ -1,15 +1,15 @@
-import io
+from ygo.message_reader import MessageReader
 
 def msg_flipsummoning(self, data):
-	data = io.BytesIO(data[1:])
+	data = MessageReader(data, 1)
 	code = self.read_u32(data)
 	location = self.read_u32(data)
 	c = location & 0xff
 	loc = (location >> 8) & 0xff;
 	seq = (location >> 16) & 0xff
-	card = self.get_card(c, loc, seq)
+	card = self.find_card(c, loc, seq)
 	self.cm.call_callbacks('flipsummoning', card)
-	return data.read()
+	return data.pos
 
 def flipsummoning(self, card):
 	cpl = self.players[card.controller]
@@ -19,6 +19,9 @@ def flipsummoning(self, card):
 		pl.notify(pl._("{player} flip summons {card} ({spec}).")
 		.format(player=cpl.nickname, card=card.get_name(pl), spec=spec))
 
-MESSAGES = {64: msg_flipsummoning}
+def msg_flipsummoned(self, data):
+	return 1
+
+MESSAGES = {64: msg_flipsummoning, 65: msg_flipsummoned}
 
 CALLBACKS = {'flipsummoning': flipsummoning}
@@ -1,16 +1,16 @@
-import io
 from twisted.internet import reactor
 
+from ygo.message_reader import MessageReader
 from ygo.utils import process_duel
 from ygo import globals
 
 def msg_hint(self, data):
-	data = io.BytesIO(data[1:])
+	data = MessageReader(data, 1)
 	msg = self.read_u8(data)
 	player = self.read_u8(data)
 	value = self.read_u32(data)
 	self.cm.call_callbacks('hint', msg, player, value)
-	return data.read()
+	return data.pos
 
 def hint(self, msg, player, data):
 	pl = self.players[player]
@@ -23,6 +23,20 @@ def hint(self, msg, player, data):
 		op.notify(globals.strings[op.language]['system'][1512] % data)
 		reactor.callLater(0, process_duel, self)
 
-MESSAGES = {2: msg_hint}
+def msg_card_hint(self, data):
+	data = MessageReader(data, 1)
+	location = self.read_u32(data)
+	msg = self.read_u8(data)
+	value = self.read_u32(data)
+	return data.pos
+
+def msg_player_hint(self, data):
+	data = MessageReader(data, 1)
+	player = self.read_u8(data)
+	msg = self.read_u8(data)
+	value = self.read_u32(data)
+	return data.pos
+
+MESSAGES = {2: msg_hint, 160: msg_card_hint, 165: msg_player_hint}
 
 CALLBACKS = {'hint': hint}
@@ -1,8 +1,8 @@
-import io
+from ygo.message_reader import MessageReader
 
 def msg_idlecmd(self, data):
 	self.state = 'idle'
-	data = io.BytesIO(data[1:])
+	data = MessageReader(data, 1)
 	player = self.read_u8(data)
 	summonable = self.read_cardlist(data)
 	spsummon = self.read_cardlist(data)
@@ -14,7 +14,7 @@ def msg_idlecmd(self, data):
 	to_ep = self.read_u8(data)
 	cs = self.read_u8(data)
 	self.cm.call_callbacks('idle', summonable, spsummon, repos, idle_mset, idle_set, idle_activate, to_bp, to_ep, cs)
-	return data.read()
+	return data.pos
 
 def idle(self, summonable, spsummon, repos, idle_mset, idle_set, idle_activate, to_bp, to_ep, cs):
 	self.state = "idle"
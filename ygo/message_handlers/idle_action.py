@@ -20,7 +20,7 @@ def idle_action(self, pl):
 	cards = []
 	for i in (0, 1):
 		for j in (LOCATION_HAND, LOCATION_MZONE, LOCATION_SZONE, LOCATION_GRAVE, LOCATION_EXTRA):
-			cards.extend(self.get_cards_in_location(i, j))
+			cards.extend(self.get_cards_in_location(i, j, QUERY_PROFILE_IDENTITY))
 	specs = set(card.get_spec(self.tp) for card in cards)
 	def r(caller):
 		if caller.text == 'b' and self.to_bp:
@@ -1,11 +1,11 @@
-import io
+from ygo.message_reader import MessageReader
 
 def msg_lpupdate(self, data):
-	data = io.BytesIO(data[1:])
+	data = MessageReader(data, 1)
 	player = self.read_u8(data)
 	lp = self.read_u32(data)
 	self.cm.call_callbacks('lpupdate', player, lp)
-	return data.read()
+	return data.pos
 
 def lpupdate(self, player, lp):
 	if lp > self.lp[player]:
@@ -1,19 +1,20 @@
-import io
+import struct
 
 from ygo.card import Card
 from ygo.constants import *
+from ygo.message_reader import MessageReader
+
+# code, previous location, new location, reason
+MOVE = struct.Struct('=4I')
 
 def msg_move(self, data):
-	data = io.BytesIO(data[1:])
-	code = self.read_u32(data)
-	location = self.read_u32(data)
-	newloc = self.read_u32(data)
-	reason = self.read_u32(data)
+	data = MessageReader(data, 1)
+	code, location, newloc, reason = data.unpack(MOVE)
 	self.cm.call_callbacks('move', code, location, newloc, reason)
-	return data.read()
+	return data.pos
 
 def move(self, code, location, newloc, reason):
-	card = Card(code)
+	card = Card(code, self.card_db)
 	card.set_location(location)
 	pl = self.players[card.controller]
 	op = self.players[1 - card.controller]
@@ -26,7 +27,7 @@ def move(self, code, location, newloc, reason):
 			s = card.get_spec(w.duel_player)
 			w.notify(w._("Card %s (%s) destroyed.") % (s, card.get_name(w)))
 	elif ploc == pnewloc and ploc in (LOCATION_MZONE, LOCATION_SZONE):
-		cnew = Card(code)
+		cnew = Card(code, self.card_db)
 		cnew.set_location(newloc)
 
 		if (location & 0xff) != (newloc & 0xff):
@@ -50,7 +51,7 @@ def move(self, code, location, newloc, reason):
 			s = card.get_spec(w.duel_player)
 			w.notify(w._("{plname} discarded {spec} ({name}).").format(plname=pl.nickname, spec=s, name=card.get_name(w)))
 	elif ploc == LOCATION_REMOVED and pnewloc in (LOCATION_SZONE, LOCATION_MZONE):
-		cnew = Card(code)
+		cnew = Card(code, self.card_db)
 		cnew.set_location(newloc)
 		pl.notify(pl._("your banished card {spec} ({name}) returns to the field at {targetspec}.").format(spec=plspec, name=card.get_name(pl), targetspec=cnew.get_spec(pl.duel_player)))
 		for w in self.watchers+[op]:
@@ -58,7 +59,7 @@ def move(self, code, location, newloc, reason):
 			ts = cnew.get_spec(w.duel_player)
 			w.notify(w._("{plname}'s banished card {spec} ({name}) returned to their field at {targetspec}.").format(plname=pl.nickname, spec=s, targetspec=ts, name=card.get_name(w)))
 	elif ploc == LOCATION_GRAVE and pnewloc in (LOCATION_SZONE, LOCATION_MZONE):
-		cnew = Card(code)
+		cnew = Card(code, self.card_db)
 		cnew.set_location(newloc)
 		pl.notify(pl._("your card {spec} ({name}) returns from the graveyard to the field at {targetspec}.").format(spec=plspec, name=card.get_name(pl), targetspec=cnew.get_spec(pl.duel_player)))
 		for w in self.watchers+[op]:
@@ -1,7 +1,7 @@
 def msg_new_turn(self, data):
 	tp = int(data[1])
 	self.cm.call_callbacks('new_turn', tp)
-	return data[2:]
+	return 2
 
 def new_turn(self, tp):
 	self.tp = tp
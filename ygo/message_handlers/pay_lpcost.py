@@ -1,11 +1,11 @@
-import io
+from ygo.message_reader import MessageReader
 
 def msg_pay_lpcost(self, data):
-	data = io.BytesIO(data[1:])
+	data = MessageReader(data, 1)
 	player = self.read_u8(data)
 	cost = self.read_u32(data)
 	self.cm.call_callbacks('pay_lpcost', player, cost)
-	return data.read()
+	return data.pos
 
 def pay_lpcost(self, player, cost):
 	self.lp[player] -= cost
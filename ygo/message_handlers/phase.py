@@ -3,9 +3,9 @@ import struct
 from ygo.constants import PHASES
 
 def msg_new_phase(self, data):
-	phase = struct.unpack('h', data[1:])[0]
+	phase = struct.unpack_from('h', data, 1)[0]
 	self.cm.call_callbacks('phase', phase)
-	return b''
+	return 3
 
 def phase(self, phase):
 	phase_str = PHASES.get(phase, str(phase))
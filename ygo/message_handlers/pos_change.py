@@ -1,18 +1,21 @@
-import io
+import struct
 
 from ygo.card import Card
+from ygo.message_reader import MessageReader
+
+# code, controller, location, sequence, previous and new position
+POS_CHANGE = struct.Struct('=I5b')
 
 def msg_pos_change(self, data):
-	data = io.BytesIO(data[1:])
-	code = self.read_u32(data)
-	card = Card(code)
-	card.controller = self.read_u8(data)
-	card.location = self.read_u8(data)
-	card.sequence = self.read_u8(data)
-	prevpos = self.read_u8(data)
-	card.position = self.read_u8(data)
+	data = MessageReader(data, 1)
+	code, controller, location, sequence, prevpos, position = data.unpack(POS_CHANGE)
+	card = Card(code, self.card_db)
+	card.controller = controller
+	card.location = location
+	card.sequence = sequence
+	card.position = position
 	self.cm.call_callbacks('pos_change', card, prevpos)
-	return data.read()
+	return data.pos
 
 def pos_change(self, card, prevpos):
 	cs = card.get_spec(card.controller)
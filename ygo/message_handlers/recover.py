@@ -1,11 +1,11 @@
-import io
+from ygo.message_reader import MessageReader
 
 def msg_recover(self, data):
-	data = io.BytesIO(data[1:])
+	data = MessageReader(data, 1)
 	player = self.read_u8(data)
 	amount = self.read_u32(data)
 	self.cm.call_callbacks('recover', player, amount)
-	return data.read()
+	return data.pos
 
 def recover(self, player, amount):
 	new_lp = self.lp[player] + amount
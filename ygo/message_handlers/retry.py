@@ -1,5 +1,5 @@
 def msg_retry(self, buf):
 	print("retry")
-	return buf[1:]
+	return 1
 
 MESSAGES = {1: msg_retry}
@@ -1,14 +1,14 @@
-import io
+from ygo.message_reader import MessageReader
 
 def msg_select_battlecmd(self, data):
-	data = io.BytesIO(data[1:])
+	data = MessageReader(data, 1)
 	player = self.read_u8(data)
 	activatable = self.read_cardlist(data, True)
 	attackable = self.read_cardlist(data, True, True)
 	to_m2 = self.read_u8(data)
 	to_ep = self.read_u8(data)
 	self.cm.call_callbacks('select_battlecmd', player, activatable, attackable, to_m2, to_ep)
-	return data.read()
+	return data.pos
 
 def select_battlecmd(self, player, activatable, attackable, to_m2, to_ep):
 	self.state = "battle"
@@ -1,47 +1,44 @@
-import io
+import struct
 from twisted.internet import reactor
 
 from ygo.card import Card
 from ygo.duel_reader import DuelReader
+from ygo.message_reader import MessageReader
 from ygo.parsers.duel_parser import DuelParser
 from ygo.utils import process_duel, parse_ints
 
+# player, cancelable, min, max, amount of cards
+HEADER = struct.Struct('=5b')
+# code, controller, location, sequence, release parameter
+TRIBUTE_CARD = struct.Struct('=I4b')
+# code, location
+CARD = struct.Struct('=2I')
+
 def msg_select_tribute(self, data):
-	data = io.BytesIO(data[1:])
-	player = self.read_u8(data)
-	cancelable = self.read_u8(data)
-	min = self.read_u8(data)
-	max = self.read_u8(data)
-	size = self.read_u8(data)
+	data = MessageReader(data, 1)
+	player, cancelable, min, max, size = data.unpack(HEADER)
 	cards = []
-	for i in range(size):
-		code = self.read_u32(data)
-		card = Card(code)
-		card.controller = self.read_u8(data)
-		card.location = self.read_u8(data)
-		card.sequence = self.read_u8(data)
-		card.position = self.get_card(card.controller, card.location, card.sequence).position
-		card.release_param = self.read_u8(data)
+	for code, controller, location, sequence, release_param in data.unpack_records(TRIBUTE_CARD, size):
+		card = Card(code, self.card_db)
+		card.controller = controller
+		card.location = location
+		card.sequence = sequence
+		card.position = self.find_card(controller, location, sequence).position
+		card.release_param = release_param
 		cards.append(card)
 	self.cm.call_callbacks('select_tribute', player, cancelable, min, max, cards)
-	return data.read()
+	return data.pos
 
 def msg_select_card(self, data):
-	data = io.BytesIO(data[1:])
-	player = self.read_u8(data)
-	cancelable = self.read_u8(data)
-	min = self.read_u8(data)
-	max = self.read_u8(data)
-	size = self.read_u8(data)
+	data = MessageReader(data, 1)
+	player, cancelable, min, max, size = data.unpack(HEADER)
 	cards = []
-	for i in range(size):
-		code = self.read_u32(data)
-		loc = self.read_u32(data)
-		card = Card(code)
+	for code, loc in data.unpack_records(CARD, size):
+		card = Card(code, self.card_db)
 		card.set_location(loc)
 		cards.append(card)
 	self.cm.call_callbacks('select_card', player, cancelable, min, max, cards)
-	return data.read()
+	return data.pos
 
 def select_card(self, player, cancelable, min_cards, max_cards, cards, is_tribute=False):
 	pl = self.players[player]
@@ -1,30 +1,27 @@
-import io
+import struct
 from twisted.internet import reactor
 
 from ygo.card import Card
 from ygo.duel_reader import DuelReader
+from ygo.message_reader import MessageReader
 from ygo.parsers.duel_parser import DuelParser
 from ygo.utils import process_duel
 
+# player, amount of chains, special count, forced, hint timing, other timing
+HEADER = struct.Struct('=4b2I')
+# effect type, code, location, effect description
+CHAIN = struct.Struct('=b3I')
+
 def msg_select_chain(self, data):
-	data = io.BytesIO(data[1:])
-	player = self.read_u8(data)
-	size = self.read_u8(data)
-	spe_count = self.read_u8(data)
-	forced = self.read_u8(data)
-	hint_timing = self.read_u32(data)
-	other_timing = self.read_u32(data)
+	data = MessageReader(data, 1)
+	player, size, spe_count, forced, hint_timing, other_timing = data.unpack(HEADER)
 	chains = []
-	for i in range(size):
-		et = self.read_u8(data)
-		code = self.read_u32(data)
-		loc = self.read_u32(data)
-		card = Card(code)
+	for et, code, loc, desc in data.unpack_records(CHAIN, size):
+		card = Card(code, self.card_db)
 		card.set_location(loc)
-		desc = self.read_u32(data)
 		chains.append((et, card, desc))
 	self.cm.call_callbacks('select_chain', player, size, spe_count, forced, chains)
-	return data.read()
+	return data.pos
 
 def select_chain(self, player, size, spe_count, forced, chains):
 	if size == 0 and spe_count == 0:
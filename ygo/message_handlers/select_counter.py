@@ -1,29 +1,31 @@
-import io
 import struct
 from twisted.internet import reactor
 
 from ygo.card import Card
 from ygo.duel_reader import DuelReader
+from ygo.message_reader import MessageReader
 from ygo.parsers.duel_parser import DuelParser
 from ygo.utils import parse_ints, process_duel
 from ygo import globals
 
+# player, counter type, amount of counters, amount of cards
+HEADER = struct.Struct('=b2hb')
+# code, controller, location, sequence, counters on the card
+CARD = struct.Struct('=I3bh')
+
 def msg_select_counter(self, data):
-	data = io.BytesIO(data[1:])
-	player = self.read_u8(data)
-	countertype = self.read_u16(data)
-	count = self.read_u16(data)
-	size = self.read_u8(data)
+	data = MessageReader(data, 1)
+	player, countertype, count, size = data.unpack(HEADER)
 	cards = []
-	for i in range(size):
-		card = Card(self.read_u32(data))
-		card.controller = self.read_u8(data)
-		card.location = self.read_u8(data)
-		card.sequence = self.read_u8(data)
-		card.counter = self.read_u16(data)
+	for code, controller, location, sequence, counter in data.unpack_records(CARD, size):
+		card = Card(code, self.card_db)
+		card.controller = controller
+		card.location = location
+		card.sequence = sequence
+		card.counter = counter
 		cards.append(card)
 	self.cm.call_callbacks('select_counter', player, countertype, count, cards)
-	return data.read()
+	return data.pos
 
 def select_counter(self, player, countertype, count, cards):
 	pl = self.players[player]
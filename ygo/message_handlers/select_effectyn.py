@@ -1,18 +1,18 @@
-import io
 from twisted.internet import reactor
 
 from ygo.card import Card
+from ygo.message_reader import MessageReader
 from ygo.parsers.yes_or_no_parser import yes_or_no_parser
 from ygo.utils import process_duel
 
 def msg_select_effectyn(self, data):
-	data = io.BytesIO(data[1:])
+	data = MessageReader(data, 1)
 	player = self.read_u8(data)
-	card = Card(self.read_u32(data))
+	card = Card(self.read_u32(data), self.card_db)
 	card.set_location(self.read_u32(data))
 	desc = self.read_u32(data)
 	self.cm.call_callbacks('select_effectyn', player, card, desc)
-	return data.read()
+	return data.pos
 
 def select_effectyn(self, player, card, desc):
 	pl = self.players[player]
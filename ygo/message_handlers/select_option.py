@@ -1,21 +1,21 @@
 from gsb.intercept import Menu
-import io
 from twisted.internet import reactor
 
 from ygo.card import Card
+from ygo.message_reader import MessageReader
 from ygo.parsers.duel_parser import DuelParser
 from ygo.utils import process_duel
 from ygo import globals
 
 def msg_select_option(self, data):
-	data = io.BytesIO(data[1:])
+	data = MessageReader(data, 1)
 	player = self.read_u8(data)
 	size = self.read_u8(data)
 	options = []
 	for i in range(size):
 		options.append(self.read_u32(data))
 	self.cm.call_callbacks("select_option", player, options)
-	return data.read()
+	return data.pos
 
 def select_option(self, player, options):
 	pl = self.players[player]
@@ -26,7 +26,7 @@ def select_option(self, player, options):
 	for opt in options:
 		if opt > 10000:
 			code = opt >> 4
-			string = Card(code).get_strings(pl)[opt & 0xf]
+			string = Card(code, self.card_db).get_strings(pl)[opt & 0xf]
 		else:
 			string = "Unknown option %d" % opt
 			string = globals.strings[pl.language]['system'].get(opt, string)
@@ -1,18 +1,18 @@
-import io
 from twisted.internet import reactor
 
 from ygo.duel_reader import DuelReader
+from ygo.message_reader import MessageReader
 from ygo.parsers.duel_parser import DuelParser
 from ygo.utils import process_duel
 
 def msg_select_place(self, data):
-	data = io.BytesIO(data)
+	data = MessageReader(data)
 	msg = self.read_u8(data)
 	player = self.read_u8(data)
 	count = self.read_u8(data)
 	flag = self.read_u32(data)
 	self.cm.call_callbacks('select_place', player, count, flag)
-	return data.read()
+	return data.pos
 
 def select_place(self, player, count, flag):
 	pl = self.players[player]
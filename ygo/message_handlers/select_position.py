@@ -1,19 +1,19 @@
 from gsb.intercept import Menu
-import io
 from twisted.internet import reactor
 
 from ygo.card import Card
+from ygo.message_reader import MessageReader
 from ygo.parsers.duel_parser import DuelParser
 from ygo.utils import process_duel
 
 def msg_select_position(self, data):
-	data = io.BytesIO(data[1:])
+	data = MessageReader(data, 1)
 	player = self.read_u8(data)
 	code = self.read_u32(data)
-	card = Card(code)
+	card = Card(code, self.card_db)
 	positions = self.read_u8(data)
 	self.cm.call_callbacks('select_position', player, card, positions)
-	return data.read()
+	return data.pos
 
 def select_position(self, player, card, positions):
 	pl = self.players[player]
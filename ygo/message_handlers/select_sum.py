@@ -1,40 +1,36 @@
-import io
+import struct
 from twisted.internet import reactor
 
 from ygo.card import Card
 from ygo.duel_reader import DuelReader
+from ygo.message_reader import MessageReader
 from ygo.parsers.duel_parser import DuelParser
 from ygo.utils import parse_ints, process_duel, check_sum
 
+# mode, player, value, min, max, amount of cards which must be selected
+HEADER = struct.Struct('=2bI3b')
+# code, controller, location, sequence, value of the card
+CARD = struct.Struct('=I3bI')
+
+def read_cards(self, data, count):
+	cards = []
+	for code, controller, location, sequence, param in data.unpack_records(CARD, count):
+		card = Card(code, self.card_db)
+		card.controller = controller
+		card.location = location
+		card.sequence = sequence
+		card.param = param
+		cards.append(card)
+	return cards
+
 def msg_select_sum(self, data):
-	data = io.BytesIO(data[1:])
-	mode = self.read_u8(data)
-	player = self.read_u8(data)
-	val = self.read_u32(data)
-	select_min = self.read_u8(data)
-	select_max = self.read_u8(data)
-	count = self.read_u8(data)
-	must_select = []
-	for i in range(count):
-		code = self.read_u32(data)
-		card = Card(code)
-		card.controller = self.read_u8(data)
-		card.location = self.read_u8(data)
-		card.sequence = self.read_u8(data)
-		card.param = self.read_u32(data)
-		must_select.append(card)
+	data = MessageReader(data, 1)
+	mode, player, val, select_min, select_max, count = data.unpack(HEADER)
+	must_select = read_cards(self, data, count)
 	count = self.read_u8(data)
-	select_some = []
-	for i in range(count):
-		code = self.read_u32(data)
-		card = Card(code)
-		card.controller = self.read_u8(data)
-		card.location = self.read_u8(data)
-		card.sequence = self.read_u8(data)
-		card.param = self.read_u32(data)
-		select_some.append(card)
+	select_some = read_cards(self, data, count)
 	self.cm.call_callbacks('select_sum', mode, player, val, select_min, select_max, must_select, select_some)
-	return data.read()
+	return data.pos
 
 def select_sum(self, mode, player, val, select_min, select_max, must_select, select_some):
 	pl = self.players[player]
@@ -1,15 +1,18 @@
-import io
+import struct
 
 from ygo.card import Card
+from ygo.message_reader import MessageReader
+
+# code, location
+SET = struct.Struct('=2I')
 
 def msg_set(self, data):
-	data = io.BytesIO(data[1:])
-	code = self.read_u32(data)
-	loc = self.read_u32(data)
-	card = Card(code)
+	data = MessageReader(data, 1)
+	code, loc = data.unpack(SET)
+	card = Card(code, self.card_db)
 	card.set_location(loc)
 	self.cm.call_callbacks('set', card)
-	return data.read()
+	return data.pos
 
 def set(self, card):
 	c = card.controller
@@ -1,10 +1,10 @@
-import io
+from ygo.message_reader import MessageReader
 
 def msg_shuffle(self, data):
-	data = io.BytesIO(data[1:])
+	data = MessageReader(data, 1)
 	player = self.read_u8(data)
 	self.cm.call_callbacks('shuffle', player)
-	return data.read()
+	return data.pos
 
 def shuffle(self, player):
 	pl = self.players[player]
@@ -12,6 +12,25 @@ def shuffle(self, player):
 	for pl in self.watchers+[self.players[1 - player]]:
 		pl.notify(pl._("%s shuffled their deck.")%(self.players[player].nickname))
 
-MESSAGES = {32: msg_shuffle}
+def msg_shuffle_hand(self, data):
+	data = MessageReader(data, 1)
+	player = self.read_u8(data)
+	count = self.read_u8(data)
+	codes = [self.read_u32(data) & 0x7fffffff for i in range(count)]
+	self.cm.call_callbacks('shuffle_hand', player, codes)
+	return data.pos
+
+def msg_refresh_deck(self, data):
+	data = MessageReader(data, 1)
+	player = self.read_u8(data)
+	return data.pos
+
+def msg_swap_grave_deck(self, data):
+	data = MessageReader(data, 1)
+	player = self.read_u8(data)
+	self.cm.call_callbacks('swap_grave_deck', player)
+	return data.pos
+
+MESSAGES = {32: msg_shuffle, 33: msg_shuffle_hand, 34: msg_refresh_deck, 35: msg_swap_grave_deck}
 
 CALLBACKS = {'shuffle': shuffle}
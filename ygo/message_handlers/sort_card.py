@@ -1,24 +1,29 @@
-import io
+import struct
 from twisted.internet import reactor
 
 from ygo.card import Card
 from ygo.duel_reader import DuelReader
+from ygo.message_reader import MessageReader
 from ygo.parsers.duel_parser import DuelParser
 from ygo.utils import process_duel, parse_ints
 
+# player, amount of cards
+HEADER = struct.Struct('=2b')
+# code, controller, location, sequence
+CARD = struct.Struct('=I3b')
+
 def msg_sort_card(self, data):
-	data = io.BytesIO(data[1:])
-	player = self.read_u8(data)
-	size = self.read_u8(data)
+	data = MessageReader(data, 1)
+	player, size = data.unpack(HEADER)
 	cards = []
-	for i in range(size):
-		card = Card(self.read_u32(data))
-		card.controller = self.read_u8(data)
-		card.location = self.read_u8(data)
-		card.sequence = self.read_u8(data)
+	for code, controller, location, sequence in data.unpack_records(CARD, size):
+		card = Card(code, self.card_db)
+		card.controller = controller
+		card.location = location
+		card.sequence = sequence
 		cards.append(card)
 	self.cm.call_callbacks('sort_card', player, cards)
-	return data.read()
+	return data.pos
 
 def sort_card(self, player, cards):
 	pl = self.players[player]
@@ -1,23 +1,23 @@
-import io
 from twisted.internet import reactor
 
 from ygo.card import Card
+from ygo.message_reader import MessageReader
 from ygo.utils import process_duel
 
 def msg_sort_chain(self, data):
-	data = io.BytesIO(data[1:])
+	data = MessageReader(data, 1)
 	player = self.read_u8(data)
 	size = self.read_u8(data)
 	cards = []
 	for i in range(size):
 		code = self.read_u32(data)
-		card = Card(code)
+		card = Card(code, self.card_db)
 		card.controller = self.read_u8(data)
 		card.location = self.read_u8(data)
 		card.sequence = self.read_u8(data)
 		cards.append(card)
 	self.cm.call_callbacks('sort_chain', player, cards)
-	return data.read()
+	return data.pos
 
 def sort_chain(self, player, cards):
 	self.set_responsei(-1)
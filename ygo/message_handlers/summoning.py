@@ -1,18 +1,20 @@
-import io
-
 from ygo.card import Card
 from ygo.constants import TYPE_LINK
+from ygo.message_reader import MessageReader
 
 def msg_summoned(self, data):
-	return data[1:]
+	return 1
+
+def msg_spsummoned(self, data):
+	return 1
 
 def msg_summoning(self, data, special=False):
-	data = io.BytesIO(data[1:])
+	data = MessageReader(data, 1)
 	code = self.read_u32(data)
-	card = Card(code)
+	card = Card(code, self.card_db)
 	card.set_location(self.read_u32(data))
 	self.cm.call_callbacks('summoning', card, special=special)
-	return data.read()
+	return data.pos
 
 def summoning(self, card, special=False):
 	nick = self.players[card.controller].nickname
@@ -28,8 +30,8 @@ def summoning(self, card, special=False):
 
 def msg_summoning_special(self, *args, **kwargs):
 	kwargs['special'] = True
-	self.msg_summoning(*args, **kwargs)
+	return self.msg_summoning(*args, **kwargs)
 
-MESSAGES = {60: msg_summoning, 62: msg_summoning_special, 61: msg_summoned}
+MESSAGES = {60: msg_summoning, 62: msg_summoning_special, 61: msg_summoned, 63: msg_spsummoned}
 
 CALLBACKS = {'summoning': summoning}
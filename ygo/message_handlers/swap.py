@@ -1,22 +1,23 @@
-import io
+import struct
 
 from ygo.card import Card
+from ygo.message_reader import MessageReader
+
+# code and location of both cards
+SWAP = struct.Struct('=4I')
 
 def msg_swap(self, data):
-	data = io.BytesIO(data[1:])
+	data = MessageReader(data, 1)
 
-	code1 = self.read_u32(data)
-	location1 = self.read_u32(data)
-	code2 = self.read_u32(data)
-	location2 = self.read_u32(data)
+	code1, location1, code2, location2 = data.unpack(SWAP)
 
-	card1 = Card(code1)
+	card1 = Card(code1, self.card_db)
 	card1.set_location(location1)
-	card2 = Card(code2)
+	card2 = Card(code2, self.card_db)
 	card2.set_location(location2)
 	self.cm.call_callbacks('swap', card1, card2)
 
-	return data.read()
+	return data.pos
 
 def swap(self, card1, card2):
 	for p in self.watchers+self.players:
@@ -1,9 +1,8 @@
-import io
-
 from ygo import globals
+from ygo.message_reader import MessageReader
 
 def msg_toss_coin(self, data, dice=False):
-	data = io.BytesIO(data[1:])
+	data = MessageReader(data, 1)
 	player = self.read_u8(data)
 	count = self.read_u8(data)
 	options = [self.read_u8(data) for i in range(count)]
@@ -11,7 +10,7 @@ def msg_toss_coin(self, data, dice=False):
 		self.cm.call_callbacks('toss_dice', player, options)
 	else:
 		self.cm.call_callbacks('toss_coin', player, options)
-	return data.read()
+	return data.pos
 
 def toss_coin(self, player, options):
 	players = []
@@ -33,7 +32,7 @@ def toss_dice(self, player, options):
 
 def msg_toss_dice(self, *args, **kwargs):
 	kwargs['dice'] = True
-	self.msg_toss_coin(*args, **kwargs)
+	return self.msg_toss_coin(*args, **kwargs)
 
 MESSAGES = {130: msg_toss_coin, 131: msg_toss_dice}
 
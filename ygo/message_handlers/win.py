@@ -1,13 +1,12 @@
-import io
-
 from ygo import globals
+from ygo.message_reader import MessageReader
 
 def msg_win(self, data):
-	data = io.BytesIO(data[1:])
+	data = MessageReader(data, 1)
 	player = self.read_u8(data)
 	reason = self.read_u8(data)
 	self.cm.call_callbacks('win', player, reason)
-	return data.read()
+	return data.pos
 
 def win(self, player, reason):
 	if player == 2:
@@ -1,17 +1,17 @@
-import io
 from twisted.internet import reactor
 
 from ygo.card import Card
+from ygo.message_reader import MessageReader
 from ygo.parsers.yes_or_no_parser import yes_or_no_parser
 from ygo.utils import process_duel
 from ygo import globals
 
 def msg_yesno(self, data):
-	data = io.BytesIO(data[1:])
+	data = MessageReader(data, 1)
 	player = self.read_u8(data)
 	desc = self.read_u32(data)
 	self.cm.call_callbacks('yesno', player, desc)
-	return data.read()
+	return data.pos
 
 def yesno(self, player, desc):
 	pl = self.players[player]
@@ -24,7 +24,7 @@ def yesno(self, player, desc):
 		reactor.callLater(0, process_duel, self)
 	if desc > 10000:
 		code = desc >> 4
-		opt = Card(code).get_strings(pl)[desc & 0xf]
+		opt = Card(code, self.card_db).get_strings(pl)[desc & 0xf]
 	else:
 		opt = "String %d" % desc
 		opt = globals.strings[pl.language]['system'].get(desc, opt)
@@ -0,0 +1,50 @@
+import struct
+
+# the core writes all fields in native byte order, bytes and words are
+# read as signed values, matching what the handlers always got
+U8 = struct.Struct('b')
+U16 = struct.Struct('h')
+U32 = struct.Struct('I')
+
+class MessageReader(object):
+	"""Reads the fields of messages sent by the core.
+
+	Fields are unpacked with precompiled structs straight from a memoryview
+	of the buffer, pos is the offset of the next field.
+	Message handlers describe fixed parts of their message as a struct.Struct
+	and read them at once with unpack, repeated records with unpack_records.
+	"""
+
+	__slots__ = ('buf', 'pos')
+
+	def __init__(self, data, pos=0):
+		self.buf = memoryview(data)
+		self.pos = pos
+
+	def unpack(self, s):
+		"""Returns the fields of s as a tuple."""
+		values = s.unpack_from(self.buf, self.pos)
+		self.pos += s.size
+		return values
+
+	def unpack_records(self, s, count):
+		"""Returns a list of count tuples with the fields of s."""
+		end = self.pos + s.size * count
+		records = list(s.iter_unpack(self.buf[self.pos:end]))
+		self.pos = end
+		return records
+
+	def read_u8(self):
+		value = U8.unpack_from(self.buf, self.pos)[0]
+		self.pos += 1
+		return value
+
+	def read_u16(self):
+		value = U16.unpack_from(self.buf, self.pos)[0]
+		self.pos += 2
+		return value
+
+	def read_u32(self):
+		value = U32.unpack_from(self.buf, self.pos)[0]
+		self.pos += 4
+		return value
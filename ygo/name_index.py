@@ -0,0 +1,49 @@
+from array import array
+import collections
+
+class NameIndex(object):
+	"""Case-insensitive substring search over a list of card names.
+
+	Every name is split into its trigrams, each trigram maps to the sorted
+	positions of the names containing it. A search only has to check the
+	names listed for the rarest trigram of the search text.
+	Positions are those of the names passed in, so they can be aligned
+	with any list of card codes.
+	"""
+
+	def __init__(self, names):
+		self.names = [name.lower() for name in names]
+		trigrams = collections.defaultdict(lambda: array('I'))
+		for pos, name in enumerate(self.names):
+			for trigram in set(name[i:i + 3] for i in range(len(name) - 2)):
+				trigrams[trigram].append(pos)
+		self.trigrams = dict(trigrams)
+
+	def __len__(self):
+		return len(self.names)
+
+	def search(self, text):
+		"""Returns the sorted positions of all names containing text."""
+		text = text.lower()
+		if len(text) < 3:
+			return [pos for pos, name in enumerate(self.names) if text in name]
+		candidates = None
+		for i in range(len(text) - 2):
+			positions = self.trigrams.get(text[i:i + 3])
+			if positions is None:
+				return []
+			if candidates is None or len(positions) < len(candidates):
+				candidates = positions
+		return [pos for pos in candidates if text in self.names[pos]]
+
+	def find(self, text):
+		"""Like search, but ranks exact matches first, followed by names starting with text."""
+		lower = text.lower()
+		def rank(pos):
+			name = self.names[pos]
+			if name == lower:
+				return 0
+			elif name.startswith(lower):
+				return 1
+			return 2
+		return sorted(self.search(text), key=rank)
@@ -7,7 +7,7 @@ from twisted.internet import reactor
 from twisted.python import log
 
 from ..constants import *
-from ..duel import Duel
+from ..duel import Duel, script_cache
 from .. import globals
 from ..room import Room
 from ..utils import process_duel, process_duel_replay
@@ -425,6 +425,34 @@ def challenge(caller):
 	else:
 		con.notify(con._("Challenge off."))
 
+@LobbyParser.command(allowed=lambda caller: caller.connection.player.is_admin)
+def cache_stats(caller):
+	info = globals.server.card_db.text_cache_info()
+	caller.connection.notify(caller.connection._("Card text cache: %d hits, %d misses, %d of %d entries used.") % (info.hits, info.misses, info.currsize, info.maxsize))
+
+@LobbyParser.command(allowed=lambda caller: caller.connection.player.is_admin)
+def reload_cards(caller):
+	caller.connection.notify(caller.connection._("Reloading card databases..."))
+	d = globals.server.reload_card_db()
+	def loaded(card_db):
+		caller.connection.notify(caller.connection._("Done, %d cards loaded. Running duels keep using the old cards.") % len(card_db.codes))
+	d.addCallback(loaded)
+	d.addErrback(log.err)
+
+@LobbyParser.command(allowed=lambda caller: caller.connection.player.is_admin)
+def reload_lflist(caller):
+	caller.connection.notify(caller.connection._("Reloading banlists..."))
+	d = globals.server.reload_lflist()
+	def loaded(lflist):
+		caller.connection.notify(caller.connection._("Done, %d banlists loaded.") % len(lflist))
+	d.addCallback(loaded)
+	d.addErrback(log.err)
+
+@LobbyParser.command(allowed=lambda caller: caller.connection.player.is_admin)
+def reload_scripts(caller):
+	n = script_cache.reload()
+	caller.connection.notify(caller.connection._("%d changed scripts dropped, %d still cached.") % (n, len(script_cache)))
+
 @LobbyParser.command(allowed=lambda caller: caller.connection.player.is_admin)
 def reboot(caller):
 	globals.rebooting = True
@@ -1,7 +1,6 @@
 import gsb
 import json
 
-from ..card import Card
 from ..constants import COMMAND_SUBSTITUTIONS, RE_NICKNAME
 from .. import globals
 from .. import models
@@ -236,35 +235,35 @@ def deck(caller):
 	content = json.loads(deck.content)
 
 	# we parsed the deck now we execute several checks
+	# results are cached, so popular decks are only validated once
+	banlist = room.get_banlist()
+	if banlist == 'none':
+		banlist = None
+	else:
+		banlist = room.lflist[banlist]
+	validation = globals.server.validate_deck(content['cards'], banlist)
+
 	# we check card limits first
-	main, extra = pl.count_deck_cards(content['cards'])
-	if main < 40 or main > 200:
-		pl.notify(pl._("Your main deck must contain between 40 and 200 cards (currently %d).") % main)
+	if validation.main < 40 or validation.main > 200:
+		pl.notify(pl._("Your main deck must contain between 40 and 200 cards (currently %d).") % validation.main)
 		return
 
-	if extra > 15:
-		pl.notify(pl._("Your extra deck may not contain more than 15 cards (currently %d).")%extra)
+	if validation.extra > 15:
+		pl.notify(pl._("Your extra deck may not contain more than 15 cards (currently %d).")%validation.extra)
 		return
 
 	# check against selected banlist
-	if room.get_banlist() != 'none':
-		codes = set(content['cards'])
-		errors = 0
-		for code in codes:
-			count = content['cards'].count(code)
-			if code not in globals.lflist[room.get_banlist()] or count <= globals.lflist[room.get_banlist()][code]:
-				continue
-			card = Card(code)
-			pl.notify(pl._("%s: limit %d, found %d.") % (card.get_name(pl), globals.lflist[room.get_banlist()][code], count))
-			errors += 1
-
-		if errors > 0:
-			pl.notify(pl._("Check completed with %d errors.") % errors)
-			return
+	if validation.errors:
+		for message in validation.get_messages(pl):
+			pl.notify(message)
+		pl.notify(pl._("Check completed with %d errors.") % len(validation.errors))
+		return
 
 	pl.deck = content
 	session.commit()
 	pl.notify(pl._("Deck loaded with %d cards.") % len(content['cards']))
+	# warm the caches while the players are still in the room
+	globals.server.prefetch_deck(content['cards'])
 
 	for p in room.get_all_players():
 		if p is not pl:
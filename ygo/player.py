@@ -1,6 +1,5 @@
 import gettext
 
-from .constants import *
 from . import globals
 from .deck_editor import DeckEditor
 from .i18n import set_language as i18n_set_language
@@ -51,15 +50,7 @@ class Player:
 	def count_deck_cards(self, deck = None):
 		if deck is None:
 			deck = self.deck['cards']
-		rows = self.cdb.execute('select id, type from datas where id in (%s)'%(','.join([str(c) for c in set(deck)])))
-		main = 0
-		extra = 0
-		for row in rows:
-			if row[1]&(TYPE_XYZ | TYPE_SYNCHRO | TYPE_FUSION | TYPE_LINK):
-				extra += deck.count(row[0])
-			else:
-				main += deck.count(row[0])
-
+		main, extra, _ = globals.server.card_db.count_deck(deck)
 		return (main, extra)
 
 	def set_parser(self, p):
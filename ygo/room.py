@@ -10,6 +10,8 @@ class Room:
 		self.rules = 0
 		self.invitations = []
 		self.banlist = 'tcg'
+		# the banlists this room chose from, kept when lflist.conf is reloaded
+		self.lflist = globals.lflist
 
 	def get_all_players(self):
 		return self.teams[0]+self.teams[1]+self.teams[2]
@@ -69,19 +71,12 @@ class Room:
 			return False
 		else:
 			self.banlist = list.lower()
+			self.lflist = globals.lflist
 			return True
 
 	def get_banlist(self):
-		if self.banlist == 'tcg':
-			# always the newest tcg list
-			lst = [l for l in globals.lflist if l.endswith('tcg')]
-			return lst[0]
-		elif self.banlist == 'ocg':
-			# always the newest ocg list
-			lst = [l for l in globals.lflist.keys() if not l.endswith('tcg')]
-			return lst[0]
-		else:
-			return self.banlist
+		# tcg and ocg are always the newest list of that kind
+		return self.lflist.resolve(self.banlist)
 
 	def move(self, player, team):
 
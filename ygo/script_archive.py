@@ -0,0 +1,69 @@
+"""Packed script archive.
+
+All Lua scripts of the script directory are packed into a single file
+which is memory-mapped by the server. The file contains a header,
+an index with one entry per script and the concatenated scripts:
+
+header: magic, version and the amount of scripts
+index: for every script its name (utf-8, padded to 48 bytes),
+	the offset of its contents from the start of the file and their length
+"""
+
+import mmap
+import os
+import os.path
+import struct
+
+MAGIC = b'YGOSCRPT'
+VERSION = 1
+HEADER = struct.Struct('<8sII')
+ENTRY = struct.Struct('<48sQQ')
+
+def build(script_dir, filename):
+	names = sorted(fn for fn in os.listdir(script_dir) if fn.endswith('.lua'))
+	for name in names:
+		if len(name.encode('utf-8')) > 48:
+			raise ValueError("Script name too long: %s" % name)
+	contents = []
+	for name in names:
+		with open(os.path.join(script_dir, name), 'rb') as fp:
+			contents.append(fp.read())
+	tmp = filename + '.tmp'
+	with open(tmp, 'wb') as fp:
+		fp.write(HEADER.pack(MAGIC, VERSION, len(names)))
+		offset = HEADER.size + ENTRY.size * len(names)
+		for name, data in zip(names, contents):
+			fp.write(ENTRY.pack(name.encode('utf-8'), offset, len(data)))
+			offset += len(data)
+		for data in contents:
+			fp.write(data)
+	# replacing the archive at once lets running servers see either version completely
+	os.replace(tmp, filename)
+	return len(names)
+
+class ScriptArchive(object):
+	"""Read-only view on a packed script archive."""
+
+	def __init__(self, filename):
+		with open(filename, 'rb') as fp:
+			self.mtime = os.fstat(fp.fileno()).st_mtime
+			self.mmap = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+		self.buf = memoryview(self.mmap)
+		magic, version, count = HEADER.unpack_from(self.buf)
+		if magic != MAGIC or version != VERSION:
+			raise ValueError("%s is not a script archive of version %d" % (filename, VERSION))
+		self.index = {}
+		for i in range(count):
+			name, offset, length = ENTRY.unpack_from(self.buf, HEADER.size + i * ENTRY.size)
+			self.index[name.rstrip(b'\0').decode('utf-8')] = (offset, length)
+
+	def get(self, name):
+		"""Returns a memoryview of a script or None if it isn't part of the archive."""
+		entry = self.index.get(name)
+		if entry is None:
+			return
+		offset, length = entry
+		return self.buf[offset:offset + length]
+
+	def __len__(self):
+		return len(self.index)
@@ -0,0 +1,142 @@
+import os
+import os.path
+import threading
+
+from _duel import ffi, lib
+
+from .script_archive import ScriptArchive
+
+SCRIPT_DIR = 'script'
+
+def compile_script(name, data):
+	"""Returns a buffer with the Lua bytecode of a script and its length.
+
+	Scripts which don't compile are returned as they are,
+	so the core reports the error when loading them.
+	"""
+	script = ffi.from_buffer(data)
+	buf = ffi.new('char[]', len(data) * 2)
+	n = lib.compile_script(name, script, len(data), buf, len(buf))
+	if n < 0:
+		return ffi.new('char[]', bytes(data)), len(data)
+	if n > len(buf):
+		buf = ffi.new('char[]', n)
+		lib.compile_script(name, script, len(data), buf, n)
+	return buf, n
+
+class Script(object):
+	__slots__ = ('buf', 'ptr', 'length', 'mtime')
+
+	def __init__(self, buf, length, mtime):
+		# the core reads the script straight from this buffer
+		self.buf = buf
+		self.ptr = ffi.cast('byte *', buf)
+		self.length = length
+		# None for scripts from the archive
+		self.mtime = mtime
+
+class ScriptCache(object):
+	"""Lua scripts by the file name the core asks for.
+
+	Scripts are read and compiled into Lua bytecode once, so new duels
+	only have to load the bytecode. Scripts which don't exist are
+	remembered as None. If a packed script archive exists, scripts of
+	the script directory are read from it, and only from it,
+	so all duels see the same version of every script.
+	reload drops all scripts whose file changed since they were read.
+	The cache keeps the buffers handed to the core alive, so a stored
+	Script is never replaced while it may still be in use: scripts may
+	be loaded from several threads, the first one stored wins.
+	"""
+
+	def __init__(self, archive_file=None):
+		self.archive_file = archive_file
+		self.archive = None
+		self.scripts = {}
+		# guards inserting and dropping scripts
+		self.lock = threading.Lock()
+		self.open_archive()
+
+	def open_archive(self):
+		if self.archive_file is not None and os.path.exists(self.archive_file):
+			self.archive = ScriptArchive(self.archive_file)
+		else:
+			self.archive = None
+
+	def get(self, name):
+		"""Returns the Script for a file name (bytes) or None if it doesn't exist."""
+		try:
+			return self.scripts[name]
+		except KeyError:
+			pass
+		script = self.load(name)
+		# another thread may have loaded it meanwhile and handed it out
+		with self.lock:
+			return self.scripts.setdefault(name, script)
+
+	def prefetch(self, names):
+		"""Loads the given scripts, returns how many weren't cached before."""
+		n = 0
+		for name in names:
+			if name not in self.scripts:
+				self.get(name)
+				n += 1
+		return n
+
+	def load(self, name):
+		if self.archive is not None:
+			dirname, basename = os.path.split(os.path.normpath(name.decode('utf-8')))
+			if dirname == SCRIPT_DIR:
+				data = self.archive.get(basename)
+				if data is None:
+					return
+				return Script(*compile_script(name, data), None)
+		try:
+			with open(name, 'rb') as fp:
+				mtime = os.fstat(fp.fileno()).st_mtime
+				data = fp.read()
+		except FileNotFoundError:
+			return
+		return Script(*compile_script(name, data), mtime)
+
+	def archive_changed(self):
+		if self.archive_file is None:
+			return False
+		try:
+			mtime = os.stat(self.archive_file).st_mtime
+		except FileNotFoundError:
+			mtime = None
+		return mtime != (self.archive.mtime if self.archive is not None else None)
+
+	def reload(self):
+		"""Drops changed scripts, returns how many were dropped.
+
+		Dropping frees the buffers of those scripts, so this must only be
+		called from the reactor thread and never while the core is
+		processing, as the core may be reading a script just handed to it.
+		"""
+		with self.lock:
+			return self.drop_changed()
+
+	def drop_changed(self):
+		if self.archive_changed():
+			n = len(self.scripts)
+			self.scripts.clear()
+			self.open_archive()
+			return n
+		changed = []
+		for name, script in list(self.scripts.items()):
+			if script is not None and script.mtime is None:
+				continue
+			try:
+				mtime = os.stat(name).st_mtime
+			except FileNotFoundError:
+				mtime = None
+			if mtime != (script.mtime if script is not None else None):
+				changed.append(name)
+		for name in changed:
+			del self.scripts[name]
+		return len(changed)
+
+	def __len__(self):
+		return len(self.scripts)
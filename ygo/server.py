@@ -1,13 +1,15 @@
 import re
 import random
-import sqlite3
 import gsb
 
-from twisted.internet import reactor
+from twisted.internet import reactor, threads
+from twisted.python import log
 
 from .card import Card
-from .duel import Duel
-from .utils import process_duel
+from .card_database import CardDatabase
+from .deck_validation import DeckValidator
+from .duel import Duel, prefetch_scripts
+from .utils import parse_lflist, process_duel
 from . import globals
 from . import models
 
@@ -15,11 +17,48 @@ class Server(gsb.Server):
 
 	def __init__(self, *args, **kwargs):
 		gsb.Server.__init__(self, *args, **kwargs)
-		self.db = sqlite3.connect('locale/en/cards.cdb')
-		self.db.row_factory = sqlite3.Row
+		self.card_db = None
+		self.deck_validator = DeckValidator()
+		self.set_card_db(CardDatabase('locale', 'cards.bin'))
 		self.players = {}
 		self.session_factory = models.setup()
-		self.all_cards = [int(row[0]) for row in self.db.execute("select id from datas")]
+
+	def set_card_db(self, card_db):
+		"""Makes card_db the card database snapshot used by new duels."""
+		old = self.card_db
+		self.card_db = card_db
+		self.all_cards = list(card_db.codes)
+		# code -> position in all_cards
+		self.card_positions = card_db.index
+		self.deck_validator.clear()
+		if old is not None:
+			self.release_card_db(old)
+
+	def reload_card_db(self):
+		"""Loads the card databases again in a thread and switches new duels over to them."""
+		def loaded(card_db):
+			self.set_card_db(card_db)
+			return card_db
+		d = threads.deferToThread(CardDatabase, 'locale', 'cards.bin')
+		d.addCallback(loaded)
+		return d
+
+	def reload_lflist(self):
+		"""Parses lflist.conf again in a thread and replaces the banlists.
+
+		Rooms keep the banlists they were using before.
+		"""
+		def loaded(lflist):
+			globals.lflist = lflist
+			self.deck_validator.clear()
+			return lflist
+		d = threads.deferToThread(parse_lflist, 'lflist.conf')
+		d.addCallback(loaded)
+		return d
+
+	def release_card_db(self, card_db):
+		if card_db is not self.card_db and not card_db.duels:
+			card_db.close()
 
 	def on_connect(self, caller):
 		### for backwards compatibility ###
@@ -104,7 +143,29 @@ class Server(gsb.Server):
 			return
 		pl.notify("Challenge: " + text)
 
-	def get_card_by_name(self, pl, name):
+	def prefetch_deck(self, cards):
+		"""Warms card data and scripts for a deck which is going to be used in a duel.
+
+		Scripts are loaded in a thread, card data is read from memory
+		and needs no more than a handful of queries, so it's loaded right away.
+		"""
+		codes = set(code for code in cards if code in self.card_db.index)
+		new_cards = 0
+		for code in codes:
+			if code not in self.card_db.card_data:
+				self.card_db.get(code)
+				new_cards += 1
+		d = threads.deferToThread(prefetch_scripts, codes)
+		def done(new_scripts):
+			log.msg("Prefetched %d of %d cards and %d scripts for a deck." % (new_cards, len(codes), new_scripts))
+		d.addCallback(done)
+		return d
+
+	def validate_deck(self, cards, banlist=None):
+		"""Validates a list of codes against a Banlist."""
+		return self.deck_validator.validate(cards, banlist, self.card_db)
+
+	def get_card_by_name(self, pl, name, card_db=None):
 		r = re.compile(r'^(\d+)\.(.+)$')
 		r = r.search(name)
 		if r:
@@ -113,12 +174,12 @@ class Server(gsb.Server):
 			n = 1
 		if n == 0:
 			n = 1
-		name = '%'+name+'%'
-		rows = pl.cdb.execute('select id from texts where name like ? limit ?', (name, n)).fetchall()
-		if not rows:
+		if card_db is None:
+			card_db = self.card_db
+		codes = card_db.find_cards(pl.language, name)
+		if not codes:
 			return
-		nr = rows[min(n - 1, len(rows) - 1)]
-		card = Card(nr[0])
+		card = Card(codes[min(n - 1, len(codes) - 1)], card_db)
 		return card
 
 	def check_reboot(self):
@@ -3,6 +3,8 @@ import natsort
 
 from _duel import ffi, lib
 
+from .banlist import Banlist, LFList
+
 def parse_lflist(filename):
 	lst = {}
 	with open(filename, 'r', encoding='utf-8') as fp:
@@ -18,7 +20,8 @@ def parse_lflist(filename):
 				code = int(code)
 				num_allowed = int(num_allowed)
 				lst[section][code] = num_allowed
-	return collections.OrderedDict(natsort.natsorted(lst.items(), reverse=True))
+	lists = natsort.natsorted(lst.items(), reverse=True)
+	return LFList((name, Banlist(name, limits)) for name, limits in lists)
 
 def process_duel(d):
 	while d.started:
@@ -32,9 +35,11 @@ def process_duel(d):
 			break
 
 def process_duel_replay(duel):
+	duel.use_card_db()
 	res = lib.process(duel.duel)
-	l = lib.get_message(duel.duel, ffi.cast('byte *', duel.buf))
-	data = ffi.unpack(duel.buf, l)
+	duel.field_cache.clear()
+	l = lib.get_message(duel.duel, ffi.cast('byte *', duel.message_buf))
+	data = ffi.unpack(duel.message_buf, l)
 	cb = duel.cm.callbacks
 	duel.cm.callbacks = collections.defaultdict(list)
 	def tp(t):
@@ -46,6 +51,7 @@ def process_duel_replay(duel):
 		duel.lp[player] -= amount
 	duel.cm.register_callback('recover', recover)
 	duel.cm.register_callback('damage', damage)
+	duel.field.register(duel.cm)
 	duel.process_messages(data)
 	duel.cm.callbacks = cb
 	return data